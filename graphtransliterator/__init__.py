@@ -18,41 +18,56 @@ __author__ = """A. Sean Pue"""
 __email__ = "pue@msu.edu"
 __version__ = "1.2.4"
 
-# Core classes
-from .core import CoverageTransliterator, GraphTransliterator, GraphTransliteratorSchema
+import importlib
 
 # Constants
-from .core import DEFAULT_COMPRESSION_LEVEL, HIGHEST_COMPRESSION_LEVEL
+from .compression import DEFAULT_COMPRESSION_LEVEL, HIGHEST_COMPRESSION_LEVEL
 
-# Exceptions
-from .exceptions import (
-    GraphTransliteratorException,
-    AmbiguousTransliterationRulesException,
-    NoMatchingTransliterationRuleException,
-    UnrecognizableInputTokenException,
-)
+# Classes are imported from their modules on first access (PEP 562), so that
+# importing the package, e.g. for the command line interface, does not import
+# marshmallow until it is needed.
+_lazy_imports = {
+    # Core classes
+    "CoverageTransliterator": "core",
+    "GraphTransliterator": "core",
+    "GraphTransliteratorSchema": "core",
+    # Exceptions
+    "GraphTransliteratorException": "exceptions",
+    "AmbiguousTransliterationRulesException": "exceptions",
+    "NoMatchingTransliterationRuleException": "exceptions",
+    "UnrecognizableInputTokenException": "exceptions",
+    # Graphs
+    "DirectedGraph": "graphs",
+    "VisitLoggingDirectedGraph": "graphs",
+    "VisitLoggingDict": "graphs",
+    "VisitLoggingList": "graphs",
+    # Rules
+    "TransliterationRule": "rules",
+    "OnMatchRule": "rules",
+    "WhitespaceRules": "rules",
+    # Schemas
+    "DirectedGraphSchema": "schemas",
+    "EasyReadingSettingsSchema": "schemas",
+    "OnMatchRuleSchema": "schemas",
+    "SettingsSchema": "schemas",
+    "TransliterationRuleSchema": "schemas",
+    "WhitespaceDictSettingsSchema": "schemas",
+    "WhitespaceSettingsSchema": "schemas",
+}
 
-# Graphs
-from .graphs import (
-    DirectedGraph,
-    VisitLoggingDirectedGraph,
-    VisitLoggingDict,
-    VisitLoggingList,
-)
 
-# Rules
-from .rules import TransliterationRule, OnMatchRule, WhitespaceRules
+def __getattr__(name):
+    module_name = _lazy_imports.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + module_name, __name__), name)
+    globals()[name] = value  # cache, so __getattr__ is not called again
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
 
-# Schemas
-from .schemas import (
-    DirectedGraphSchema,
-    EasyReadingSettingsSchema,
-    OnMatchRuleSchema,
-    SettingsSchema,
-    TransliterationRuleSchema,
-    WhitespaceDictSettingsSchema,
-    WhitespaceSettingsSchema,
-)
 
 __all__ = [
     # core
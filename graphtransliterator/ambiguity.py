@@ -4,7 +4,7 @@
 GraphTransliterator ambiguity-checking functions.
 """
 from .exceptions import AmbiguousTransliterationRulesException
-import itertools
+import bisect
 import logging
 
 
@@ -51,94 +51,126 @@ def check_for_ambiguity(transliterator):
     """
     ambiguity = False
 
-    all_tokens = set(transliterator._tokens.keys())
-
     rules = transliterator._rules
 
     if not rules:
         return True
 
-    max_prev = [_count_of_prev(rule) for rule in rules]
-    global_max_prev = max(max_prev)
-    max_curr_next = [_count_of_curr_and_next(rule) for rule in rules]
-    global_max_curr_next = max(max_curr_next)
+    # Only rules of the same cost can be ambiguous, so bucket rule keys by cost
+    costs = [rule.cost for rule in rules]
+    rule_keys_of_cost = {}
+    for r_i, cost in enumerate(costs):
+        rule_keys_of_cost.setdefault(cost, []).append(r_i)
+    cost_groups = [
+        (cost, group) for cost, group in rule_keys_of_cost.items() if len(group) > 1
+    ]
+    if not cost_groups:
+        return True
+
+    # Sets of tokens are represented as integer bitmasks, with one bit per token.
+    token_bits = {
+        token: 1 << i for i, token in enumerate(sorted(transliterator._tokens))
+    }
+    all_tokens = (1 << len(token_bits)) - 1
+    class_masks = {
+        token_class: _mask_of(class_tokens, token_bits)
+        for token_class, class_tokens in transliterator._tokens_by_class.items()
+    }
+
+    # Possible previous, and current and following, tokens of each rule, built
+    # in a single pass.
+    prevs = []
+    currs_and_nexts = []
+    for rule in rules:
+        prevs.append(_prev_tokens_possible(rule, class_masks, token_bits))
+        currs_and_nexts.append(
+            _curr_and_next_tokens_possible(rule, class_masks, token_bits)
+        )
+    global_max_prev = max(map(len, prevs))
+    global_max_curr_next = max(map(len, currs_and_nexts))
 
     # Generate a matrix of rules, where width is the max of
     # any previous tokens/classes + max of current/next tokens/classes.
     # Each rule's specifications starting from the max of the previous
-    # tokens/classes. Other positions are filled by the set of all possible
+    # tokens/classes. Other positions are filled by the mask of all possible
     # tokens.
 
     matrix = []
 
     width = global_max_prev + global_max_curr_next
 
-    for i, rule in enumerate(rules):
-        row = [all_tokens] * (global_max_prev - max_prev[i])
-        row += _tokens_possible(rule, transliterator._tokens_by_class)
+    for prev, curr_and_next in zip(prevs, currs_and_nexts):
+        row = [all_tokens] * (global_max_prev - len(prev)) + prev + curr_and_next
         row += [all_tokens] * (width - len(row))
-        matrix += [row]
-
-    def full_intersection(i, j):
-        """Intersection of  matrix[i] and matrix[j], else None."""
-
-        intersections = []
-        for k in range(width):
-            intersection = matrix[i][k].intersection(matrix[j][k])
-            if not intersection:
-                return None
-            intersections += [intersection]
-        return intersections
-
-    def covered_by(intersection, row):
-        """Check if intersection is covered by row."""
-        for i in range(len(intersection)):
-            diff = intersection[i].difference(row[i])
-            if diff:
-                return False
-        return True
+        matrix.append(row)
+
+    # Columns of each row that do not allow all tokens, with their masks. Only
+    # these need to be checked when testing whether a row covers an intersection.
+    constrained_columns = [
+        [(k, mask) for k, mask in enumerate(row) if mask != all_tokens]
+        for row in matrix
+    ]
+
+    # Each rule's first token is in the column after the previous tokens/classes.
+    # Rules with different first tokens cannot intersect, so these are compared
+    # before computing a full intersection.
+    first_tokens = [row[global_max_prev] for row in matrix]
+
+    easyreading_rules = {}  # by rule key, as a rule may be ambiguous with many
+
+    def easyreading_rule_of(rule_key):
+        """Easy-reading string of rule, generated once."""
+        easyreading_rule = easyreading_rules.get(rule_key)
+        if easyreading_rule is None:
+            easyreading_rule = easyreading_rules[rule_key] = _easyreading_rule(
+                rules[rule_key]
+            )
+        return easyreading_rule
+
+    # Rules by cost, so that those not more costly than a rule can be found
+    rule_keys_by_cost = sorted(range(len(rules)), key=costs.__getitem__)
+    sorted_costs = [costs[r_i] for r_i in rule_keys_by_cost]
 
     # Iterate through rules based on cost (number of tokens). If there are
     # ambiguities, then see if a less costly rule would match the rule. If it does
     # not, there is ambiguity.
 
-    for _group_val, group_iter in itertools.groupby(
-        enumerate(transliterator._rules), key=lambda x: x[1].cost
-    ):
-        group = list(group_iter)
-        if len(group) == 1:
-            continue
+    for group_cost, group in cost_groups:
+        less_costly_rows = None  # generated if an intersection is found
         for i in range(len(group) - 1):
             for j in range(i + 1, len(group)):
-                i_index = group[i][0]
-                j_index = group[j][0]
-                intersection = full_intersection(i_index, j_index)
+                i_index = group[i]
+                j_index = group[j]
+                if first_tokens[i_index] != first_tokens[j_index]:
+                    break
+                intersection = _full_intersection(matrix[i_index], matrix[j_index])
                 if not intersection:
                     break
 
                 # Check if a less costly rule matches intersection
 
-                def covered_by_less_costly():
-                    for r_i, rule in enumerate(rules):
-                        if r_i in (i_index, j_index):
-                            continue
-                        if rule.cost > rules[i_index].cost:
-                            continue
-                        rule_tokens = matrix[r_i]
-                        if covered_by(intersection, rule_tokens):
-                            return True
-                    return False
-
-                if not covered_by_less_costly():
-                    logging.warning(
-                        "The pattern {} can be matched by both:\n"
-                        "  {}\n"
-                        "  {}\n".format(
-                            intersection,
-                            _easyreading_rule(rules[i_index]),
-                            _easyreading_rule(rules[j_index]),
+                if less_costly_rows is None:
+                    less_costly_rows = [
+                        (r_i, constrained_columns[r_i])
+                        for r_i in rule_keys_by_cost[
+                            : bisect.bisect_right(sorted_costs, group_cost)
+                        ]
+                    ]
+
+                if not _covered_by_less_costly(
+                    intersection, less_costly_rows, i_index, j_index
+                ):
+                    # Only format the details if they will be logged
+                    if logging.getLogger().isEnabledFor(logging.WARNING):
+                        logging.warning(
+                            "The pattern {} can be matched by both:\n"
+                            "  {}\n"
+                            "  {}\n".format(
+                                [_tokens_of(_, token_bits) for _ in intersection],
+                                easyreading_rule_of(i_index),
+                                easyreading_rule_of(j_index),
+                            )
                         )
-                    )
                     ambiguity = True
     if ambiguity:
         raise AmbiguousTransliterationRulesException
@@ -147,68 +179,88 @@ def check_for_ambiguity(transliterator):
 def _easyreading_rule(rule):
     """Get an easy-reading string of a rule."""
 
-    def _token_str(x):
-        return " ".join(x)
+    prev_classes = " ".join(f"<{_}>" for _ in rule.prev_classes or [])
+    prev_tokens = " ".join(rule.prev_tokens or [])
+    next_tokens = " ".join(rule.next_tokens or [])
+    next_classes = " ".join(f"<{_}>" for _ in rule.next_classes or [])
 
-    def _class_str(x):
-        return " ".join(["<%s>" % _ for _ in x])
+    parts = []
+    if prev_classes and prev_tokens:
+        parts.append(f"({prev_classes} {prev_tokens})")
+    elif prev_classes:
+        parts.append(prev_classes)
+    elif prev_tokens:
+        parts.append(f"({prev_tokens})")
 
-    out = ""
-    if rule.prev_classes and rule.prev_tokens:
-        out = "({} {}) ".format(
-            _class_str(rule.prev_classes), _token_str(rule.prev_tokens)
-        )
-    elif rule.prev_classes:
-        out = "{} ".format(_class_str(rule.prev_classes))
-    elif rule.prev_tokens:
-        out = "({}) ".format(_token_str(rule.prev_tokens))
+    parts.append(" ".join(rule.tokens))
 
-    out += _token_str(rule.tokens)
+    if next_tokens and next_classes:
+        parts.append(f"({next_tokens} {next_classes})")
+    elif next_tokens:
+        parts.append(f"({next_tokens})")
+    elif next_classes:
+        parts.append(next_classes)
+    return " ".join(parts)
 
-    if rule.next_tokens and rule.next_classes:
-        out += " ({} {})".format(
-            _token_str(rule.next_tokens), _class_str(rule.next_classes)
-        )
-    elif rule.next_tokens:
-        out += " ({})".format(_token_str(rule.next_tokens))
-    elif rule.next_classes:
-        out += " {}".format(_class_str(rule.next_classes))
-    return out
 
+def _full_intersection(row_i, row_j):
+    """Intersection of two rows of bitmasks, else None."""
 
-def _count_of_prev(rule):
-    """Count previous tokens to be present before a match in a rule."""
+    intersections = []
+    for mask_i, mask_j in zip(row_i, row_j):
+        intersection = mask_i & mask_j
+        if not intersection:
+            return None
+        intersections.append(intersection)
+    return intersections
 
-    return len(rule.prev_classes or []) + len(rule.prev_tokens or [])
 
+def _covered_by_less_costly(intersection, less_costly_rows, i_index, j_index):
+    """
+    Whether a less costly rule, other than rules `i_index` and `j_index`, matches
+    all of an intersection. Rows are given as pairs of rule key and constrained
+    columns.
+    """
 
-def _count_of_curr_and_next(rule):
-    """Count tokens to be matched and those to follow them in rule."""
+    for r_i, columns in less_costly_rows:
+        if r_i == i_index or r_i == j_index:
+            continue
+        for k, mask in columns:
+            if intersection[k] & ~mask:
+                break
+        else:
+            return True
+    return False
 
-    return len(rule.tokens) + len(rule.next_tokens or []) + len(rule.next_classes or [])
 
+def _mask_of(tokens, token_bits):
+    """Bitmask of tokens."""
 
-def _prev_tokens_possible(rule, tokens_by_class):
-    """`list` of set of possible preceding tokens for a rule."""
+    mask = 0
+    for _ in tokens:
+        mask |= token_bits[_]
+    return mask
 
-    return [tokens_by_class[_] for _ in rule.prev_classes or []] + [
-        set([_]) for _ in rule.prev_tokens or []
-    ]
 
+def _tokens_of(mask, token_bits):
+    """`set` of tokens in bitmask."""
 
-def _curr_and_next_tokens_possible(rule, tokens_by_class):
-    """`list` of sets of possible current and following tokens for a rule."""
+    return {token for token, bit in token_bits.items() if mask & bit}
 
-    return (
-        [set([_]) for _ in rule.tokens]
-        + [set([_]) for _ in rule.next_tokens or []]
-        + [tokens_by_class[_] for _ in rule.next_classes or []]
-    )
+
+def _prev_tokens_possible(rule, class_masks, token_bits):
+    """`list` of bitmasks of possible preceding tokens for a rule."""
+
+    return [class_masks[_] for _ in rule.prev_classes or []] + [
+        token_bits[_] for _ in rule.prev_tokens or []
+    ]
 
 
-def _tokens_possible(row, tokens_by_class):
-    """`list` of sets of possible tokens matched for a rule."""
+def _curr_and_next_tokens_possible(rule, class_masks, token_bits):
+    """`list` of bitmasks of possible current and following tokens for a rule."""
 
-    return _prev_tokens_possible(row, tokens_by_class) + _curr_and_next_tokens_possible(
-        row, tokens_by_class
+    return (
+        [token_bits[_] for _ in rule.tokens]
+        + [token_bits[_] for _ in rule.next_tokens or []]
+        + [class_masks[_] for _ in rule.next_classes or []]
     )
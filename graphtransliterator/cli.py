@@ -2,18 +2,14 @@
 
 """Console script for graphtransliterator."""
 
-from graphtransliterator import (
-    DEFAULT_COMPRESSION_LEVEL,
-    HIGHEST_COMPRESSION_LEVEL,
-    GraphTransliterator,
-)
+from graphtransliterator import DEFAULT_COMPRESSION_LEVEL, HIGHEST_COMPRESSION_LEVEL
 import click
-import json
 import os
 import re
 import sys
 from graphtransliterator import __version__
 
+
 @click.group()
 @click.version_option(__version__)
 def main():
@@ -22,17 +18,19 @@ def main():
 
 def load_transliterator(source, **kwargs):
     """Loads transliterator (format, parameter)."""
+    from graphtransliterator import GraphTransliterator
+    import graphtransliterator.transliterators as transliterators
+    import json
+
     format, parameter = source
     if format == "bundled":
-        mod = __import__("graphtransliterator.transliterators")
-        transliterators_mod = mod.transliterators
-        transliterator_class = getattr(transliterators_mod, parameter)
+        transliterator_class = getattr(transliterators, parameter)
         return transliterator_class(**kwargs)
     elif format == "json":
         return GraphTransliterator.loads(parameter, **kwargs)
     elif format == "json_file":
-        with open(parameter, "r") as f:
-            return GraphTransliterator.loads(f.read(), **kwargs)
+        with open(parameter, "rb") as f:  # parsed as bytes, without decoding first
+            return GraphTransliterator.load(json.load(f), **kwargs)
     elif format == "yaml_file":
         return GraphTransliterator.from_yaml_file(parameter, **kwargs)
 
@@ -78,13 +76,15 @@ def load_transliterator(source, **kwargs):
 @click.argument("input", nargs=-1)
 def transliterate(from_, to, input, check_ambiguity, ignore_errors):
     """Transliterate INPUT."""
+    import json
+
     transliterator = load_transliterator(
         from_, check_ambiguity=check_ambiguity, ignore_errors=ignore_errors
     )
     if len(input) == 1:
         output = transliterator.transliterate(input[0])
     else:
-        output = [transliterator.transliterate(_) for _ in input]
+        output = transliterator.transliterate_many(input)
     if to == "json":
         click.echo(json.dumps(output))
     else:
@@ -136,6 +136,8 @@ def dump_tests(bundled, to):
     transliterator = load_transliterator(["bundled", bundled])
 
     if to == "json":
+        import json
+
         transliteration_tests = transliterator.load_yaml_tests()
         click.echo(json.dumps(transliteration_tests))
     elif to == "yaml":
@@ -165,12 +167,10 @@ def dump_tests(bundled, to):
 )
 def generate_tests(from_, check_ambiguity):
     """Generate tests as YAML."""
-    import graphtransliterator.transliterators  # pragma: no cover
+    import graphtransliterator.transliterators as transliterators  # pragma: no cover
 
     transliterator = load_transliterator(from_, check_ambiguity=check_ambiguity)
-    yaml_tests = graphtransliterator.transliterators.Bundled.generate_yaml_tests(
-        transliterator
-    )
+    yaml_tests = transliterators.Bundled.generate_yaml_tests(transliterator)
     click.echo(yaml_tests)
 
 
@@ -213,9 +213,11 @@ def make_json(bundled, regex):
     """Make JSON rules of BUNDLED transliterator(s)."""
     import graphtransliterator.transliterators as transliterators  # pragma: no cover
 
-    if not regex:
-        bundled = f"^{bundled}$"
-    to_dump = [_ for _ in transliterators.iter_names() if re.match(bundled, _)]
+    if regex:
+        matches = re.compile(bundled).match
+    else:
+        matches = re.compile(re.escape(bundled)).fullmatch
+    to_dump = [_ for _ in transliterators.iter_names() if matches(_)]
     if not to_dump:
         click.echo(f"No bundled transliterator found matching /{bundled}/.")
         click.echo('Try "graphtransliterator list-bundled" for a list.')
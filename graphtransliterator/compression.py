@@ -2,7 +2,12 @@
 """
 Functions used to compress and decompress a GraphTransliterator.
 """
+import functools
 import math
+from operator import itemgetter
+
+DEFAULT_COMPRESSION_LEVEL = 2
+HIGHEST_COMPRESSION_LEVEL = 2
 
 
 def compress_config(config, compression_level=1):
@@ -99,120 +104,60 @@ def compress_config(config, compression_level=1):
     if compression_level == 0:
         return config
 
-    def compressed_cost(x):
-        return -1 * round((1 / (2**x - 1) - 1))  # convert to -int
-
-    def compress_edge_data(data):
-        constraints = data.get("constraints")
-
-        def _class_ids_of(constraint_attr):
-            v = constraints.get(constraint_attr)
-            if not v:
-                return 0
-            return [_class_id[_] for _ in v]
-
-        def _token_ids_of(constraint_attr):
-            v = constraints.get(constraint_attr)
-            if not v:
-                return 0
-            return [_token_id[_] for _ in v]
-
-        new_constraints = 0
-
-        if constraints:
-            new_constraints = [
-                _class_ids_of("prev_classes"),
-                _token_ids_of("prev_tokens"),
-                _token_ids_of("next_tokens"),
-                _class_ids_of("next_classes"),
-            ]
-        new_cost = compressed_cost(data.get("cost"))
-        new_token = -1
-        _token = data.get("token")
-        if _token:
-            new_token = _token_id[_token]
-
-        return tuple([new_constraints, new_cost, new_token])
-
-    def compress_node(_node):
-        def compressed_ordered_children():
-            x = _node.get("ordered_children")
-            out = {}
-            for k, v in x.items():
-                if k == "__rules__":
-                    out[-1] = v
-                else:
-                    out[_token_id[k]] = v
-            return out
-
-        _type_id = _nodetype_id[_node["type"]]
-        _accepting = 1 if _node.get("accepting") else 0
-
-        if _node["type"] == "Start":
-            new_node = tuple([_type_id, _accepting, compressed_ordered_children()])
-        elif _node["type"] == "rule":
-            new_node = tuple([_type_id, _accepting, _node["rule_key"]])
-        elif _node["type"] == "token":
-            new_node = tuple(
-                [
-                    _type_id,
-                    _accepting,
-                    _token_id[_node["token"]],
-                    compressed_ordered_children(),
-                ]
-            )
-        return new_node
-
-    token_list = tuple(sorted(config["tokens"].keys()))
+    _tokens = config["tokens"]
+    token_list = tuple(sorted(_tokens.keys()))
     _token_id = {_: i for i, _ in enumerate(token_list)}
 
-    class_list = tuple(sorted(set().union(*config["tokens"].values())))
+    token_classes = set()
+    add_token_classes = token_classes.update
+    for _ in _tokens.values():
+        add_token_classes(_)
+    class_list = tuple(sorted(token_classes))
     _class_id = {_: i for i, _ in enumerate(class_list)}
-    tokens = tuple(
-        tuple(_class_id[_] for _ in config["tokens"][tkn]) for tkn in token_list
-    )
-    nodetype_list = tuple(sorted(set([_["type"] for _ in config["graph"]["node"]])))
+    # Bound lookups, used per token and rule
+    token_id_of = _token_id.__getitem__
+    class_id_of = _class_id.__getitem__
+    tokens = tuple(tuple(map(class_id_of, _tokens[tkn])) for tkn in token_list)
+    nodetype_list = tuple(sorted({_["type"] for _ in config["graph"]["node"]}))
     _nodetype_id = {_: i for i, _ in enumerate(nodetype_list)}
 
-    rules = tuple(
-        (
-            r["production"],
-            tuple(_class_id[_] for _ in r.get("prev_classes"))
-            if r.get("prev_classes")
-            else 0,
-            tuple(_token_id[_] for _ in r.get("prev_tokens"))
-            if r.get("prev_tokens")
-            else 0,
-            tuple(_token_id[_] for _ in r.get("tokens")),
-            tuple(_token_id[_] for _ in r.get("next_tokens"))
-            if r.get("next_tokens")
-            else 0,
-            tuple(_class_id[_] for _ in r.get("next_classes"))
-            if r.get("next_classes")
-            else 0,
-            compressed_cost(r["cost"]),
+    rules = []
+    rules_append = rules.append
+    for r in config["rules"]:
+        get_field = r.get
+        prev_classes = get_field("prev_classes")
+        prev_tokens = get_field("prev_tokens")
+        next_tokens = get_field("next_tokens")
+        next_classes = get_field("next_classes")
+        rules_append(
+            (
+                r["production"],
+                tuple(map(class_id_of, prev_classes)) if prev_classes else 0,
+                tuple(map(token_id_of, prev_tokens)) if prev_tokens else 0,
+                tuple(map(token_id_of, r["tokens"])),
+                tuple(map(token_id_of, next_tokens)) if next_tokens else 0,
+                tuple(map(class_id_of, next_classes)) if next_classes else 0,
+                _compressed_cost(r["cost"]),
+            )
         )
-        for r in config["rules"]
-    )
-    whitespace = tuple(
-        [
-            config["whitespace"]["default"],
-            config["whitespace"]["token_class"],
-            1 if config["whitespace"]["consolidate"] else 0,
-        ]
+    rules = tuple(rules)
+    _whitespace = config["whitespace"]
+    whitespace = (
+        _whitespace["default"],
+        _whitespace["token_class"],
+        1 if _whitespace["consolidate"] else 0,
     )
+    _onmatch_rules = config.get("onmatch_rules")
     onmatch_rules = (
         tuple(
-            tuple(
-                [
-                    tuple(_class_id[_] for _ in r["prev_classes"]),
-                    tuple(_class_id[_] for _ in r["next_classes"]),
-                    r["production"],
-                ]
+            (
+                tuple(map(class_id_of, r["prev_classes"])),
+                tuple(map(class_id_of, r["next_classes"])),
+                r["production"],
             )
-            for r in config["onmatch_rules"]
+            for r in _onmatch_rules
         )
-        if config.get("onmatch_rules")
+        if _onmatch_rules
         else 0
     )
     metadata = config.get("metadata", 0)
@@ -220,42 +165,127 @@ def compress_config(config, compression_level=1):
     if compression_level == 1:
         # Compress with generated graph; no information loss.
         _graph = config.get("graph")
-        node = tuple(compress_node(_) for _ in _graph["node"])
+        node = tuple(_compress_node(_, _token_id, _nodetype_id) for _ in _graph["node"])
         _edge = _graph["edge"]
-        edge = {
-            int(head_id): {
-                int(tail_id): compress_edge_data(edge_data)
-                for tail_id, edge_data in tail.items()
+        if _has_int_keys(_edge):
+            edge = {
+                head_id: {
+                    tail_id: _compress_edge_data(edge_data, _token_id, _class_id)
+                    for tail_id, edge_data in tail.items()
+                }
+                for head_id, tail in _edge.items()
+            }
+        else:  # keys are strings, e.g. from JSON
+            edge = {
+                int(head_id): {
+                    int(tail_id): _compress_edge_data(edge_data, _token_id, _class_id)
+                    for tail_id, edge_data in tail.items()
+                }
+                for head_id, tail in _edge.items()
             }
-            for head_id, tail in _edge.items()
-        }
-
-        return tuple(
-            [
-                class_list,
-                token_list,
-                tokens,
-                rules,
-                whitespace,
-                onmatch_rules,
-                metadata,
-                [nodetype_list, node, edge],
-            ]
+
+        return (
+            class_list,
+            token_list,
+            tokens,
+            rules,
+            whitespace,
+            onmatch_rules,
+            metadata,
+            [nodetype_list, node, edge],
         )
     elif compression_level == 2:
         # Compress without graph; no information loss.
-        return tuple(
-            [
-                class_list,
-                token_list,
-                tokens,
-                rules,
-                whitespace,
-                onmatch_rules,
-                metadata,
-                None,
-            ]
+        return (
+            class_list,
+            token_list,
+            tokens,
+            rules,
+            whitespace,
+            onmatch_rules,
+            metadata,
+            None,
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _compressed_cost(x):
+    """Convert cost to a negative `int`. Memoized, as rules share few costs."""
+    return -1 * round((1 / (2**x - 1) - 1))
+
+
+def _compress_edge_data(data, token_id, class_id):
+    """Compress edge data, using `dict` of token and class ids."""
+    token_id_of = token_id.__getitem__
+    class_id_of = class_id.__getitem__
+    constraints = data.get("constraints")
+
+    new_constraints = 0
+
+    if constraints:
+        get_constraint = constraints.get
+        prev_classes = get_constraint("prev_classes")
+        prev_tokens = get_constraint("prev_tokens")
+        next_tokens = get_constraint("next_tokens")
+        next_classes = get_constraint("next_classes")
+        new_constraints = [
+            list(map(class_id_of, prev_classes)) if prev_classes else 0,
+            list(map(token_id_of, prev_tokens)) if prev_tokens else 0,
+            list(map(token_id_of, next_tokens)) if next_tokens else 0,
+            list(map(class_id_of, next_classes)) if next_classes else 0,
+        ]
+    new_cost = _compressed_cost(data.get("cost"))
+    new_token = -1
+    _token = data.get("token")
+    if _token:
+        new_token = token_id_of(_token)
+
+    return (new_constraints, new_cost, new_token)
+
+
+def _compressed_ordered_children(ordered_children, token_id):
+    """Compress ordered children, using -1 as the rules key (`__rules__`)."""
+    return {
+        (-1 if k == "__rules__" else token_id[k]): v
+        for k, v in ordered_children.items()
+    }
+
+
+def _compress_node(_node, token_id, nodetype_id):
+    """Compress node, using `dict` of token and node type ids."""
+    _type_id = nodetype_id[_node["type"]]
+    _accepting = 1 if _node.get("accepting") else 0
+
+    if _node["type"] == "Start":
+        new_node = (
+            _type_id,
+            _accepting,
+            _compressed_ordered_children(_node["ordered_children"], token_id),
         )
+    elif _node["type"] == "rule":
+        new_node = (_type_id, _accepting, _node["rule_key"])
+    elif _node["type"] == "token":
+        new_node = (
+            _type_id,
+            _accepting,
+            token_id[_node["token"]],
+            _compressed_ordered_children(_node["ordered_children"], token_id),
+        )
+    return new_node
+
+
+def _has_int_keys(edge):
+    """Check if edge `dict` is already keyed by `int` node ids, so needs no `int()`."""
+    for head_id, tail in edge.items():
+        return type(head_id) is int and all(type(_) is int for _ in tail)
+    return True
+
+
+def _values_of(ids, values):
+    """Get `list` of values from their integer ids, using `itemgetter` in bulk."""
+    if len(ids) > 1:
+        return list(itemgetter(*ids)(values))
+    return [values[_] for _ in ids]
 
 
 def _strip_empty(d):
@@ -267,77 +297,71 @@ def _strip_empty(d):
     }
 
 
-def decompress_config(compressed_config):
-    def decompressed_cost(x):
-        """x will be negative."""
-        return math.log2(1 + 1 / (1 - x))
-
-    def decompress_node(_node):
-        def decompressed_ordered_children(index):
-            x = _node[index]
-            out = {}
-            for k, v in x.items():
-                k = int(k)
-                if k == -1:
-                    out["__rules__"] = v
-                else:
-                    out[_token_from_id[k]] = v
-            return out
-
-        node_type = _nodetype_from_id[_node[0]]
-        accepting = True if _node[1] else False
-        if node_type == "Start":
-            new_node = {
-                "type": node_type,
-                "accepting": accepting,
-                "ordered_children": decompressed_ordered_children(2),
-            }
-        elif node_type == "rule":
-            new_node = {"type": node_type, "accepting": accepting, "rule_key": _node[2]}
-        elif node_type == "token":
-            new_node = {
-                "type": node_type,
-                "accepting": accepting,
-                "token": _token_from_id[_node[2]],
-                "ordered_children": decompressed_ordered_children(3),
-            }
-        return _strip_empty(new_node)
-
-    def decompress_edge_data(data):
-        [_constraints, _cost, _token] = data
-
-        out = {}
-
-        def _class_from_ids_of(index):
-            v = _constraints[index]
-            if v == 0:
-                return None
-            return [_class_from_id[_] for _ in v]
-
-        def _token_from_ids_of(index):
-            v = _constraints[index]
-            if v == 0:
-                return None
-            return [_token_from_id[_] for _ in v]
-
-        if _constraints:
-            # filter out unused values
-            out["constraints"] = _strip_empty(
-                {
-                    "prev_classes": _class_from_ids_of(0),
-                    "prev_tokens": _token_from_ids_of(1),
-                    "next_tokens": _token_from_ids_of(2),
-                    "next_classes": _class_from_ids_of(3),
-                }
-            )
+@functools.lru_cache(maxsize=None)
+def _decompressed_cost(x):
+    """Convert negative `int` cost back to `float`. Memoized, as costs repeat."""
+    return math.log2(1 + 1 / (1 - x))
+
+
+def _decompressed_ordered_children(ordered_children, token_list):
+    """Decompress ordered children, restoring the rules key (`__rules__`)."""
+    # Keys are strings if loaded from JSON
+    return {
+        ("__rules__" if k == -1 else token_list[k]): v
+        for k, v in zip(map(int, ordered_children), ordered_children.values())
+    }
 
-        out["cost"] = decompressed_cost(_cost)
 
-        if _token != -1:  # -1 indicates no token
-            out["token"] = _token_from_id[_token]
+def _decompress_node(_node, token_list, nodetype_list):
+    """Decompress node, using `list` of tokens and node types."""
+    node_type = nodetype_list[_node[0]]
+    # Build node without empty values, as in an uncompressed dump
+    new_node = {"type": node_type}
+    if _node[1]:
+        new_node["accepting"] = True
+    if node_type == "Start":
+        ordered_children = _decompressed_ordered_children(_node[2], token_list)
+        if ordered_children:
+            new_node["ordered_children"] = ordered_children
+    elif node_type == "rule":
+        new_node["rule_key"] = _node[2]
+    elif node_type == "token":
+        new_node["token"] = token_list[_node[2]]
+        ordered_children = _decompressed_ordered_children(_node[3], token_list)
+        if ordered_children:
+            new_node["ordered_children"] = ordered_children
+    return new_node
+
+
+def _decompress_edge_data(data, token_list, class_list):
+    """Decompress edge data, using `list` of tokens and classes."""
+    [_constraints, _cost, _token] = data
+
+    out = {}
+
+    if _constraints:
+        # leave out unused values
+        [prev_classes, prev_tokens, next_tokens, next_classes] = _constraints
+        constraints = {}
+        if prev_classes:
+            constraints["prev_classes"] = _values_of(prev_classes, class_list)
+        if prev_tokens:
+            constraints["prev_tokens"] = _values_of(prev_tokens, token_list)
+        if next_tokens:
+            constraints["next_tokens"] = _values_of(next_tokens, token_list)
+        if next_classes:
+            constraints["next_classes"] = _values_of(next_classes, class_list)
+        out["constraints"] = constraints
+
+    out["cost"] = _decompressed_cost(_cost)
+
+    if _token != -1:  # -1 indicates no token
+        out["token"] = token_list[_token]
+
+    return out
 
-        return out
 
+def decompress_config(compressed_config):
     [
         _class_list,
         _token_list,
@@ -350,22 +374,20 @@ def decompress_config(compressed_config):
     ] = compressed_config
 
     _token_list = list(_token_list)
-    _token_from_id = {i: _ for i, _ in enumerate(_token_list)}
     _class_list = list(_class_list)
-    _class_from_id = {i: _ for i, _ in enumerate(_class_list)}
     tokens = {
-        tkn: [_class_list[_] for _ in _tokens[i]] for i, tkn in enumerate(_token_list)
+        tkn: _values_of(_tokens[i], _class_list) for i, tkn in enumerate(_token_list)
     }
     rules = [
         _strip_empty(
             {
                 "production": _[0],
-                "prev_classes": [_class_list[i] for i in _[1]] if _[1] else [],
-                "prev_tokens": [_token_list[i] for i in _[2]] if _[2] else [],
-                "tokens": [_token_list[i] for i in _[3]],
-                "next_tokens": [_token_list[i] for i in _[4]] if _[4] else [],
-                "next_classes": [_class_list[i] for i in _[5]] if _[5] else [],
-                "cost": decompressed_cost(_[6]),
+                "prev_classes": _values_of(_[1], _class_list) if _[1] else [],
+                "prev_tokens": _values_of(_[2], _token_list) if _[2] else [],
+                "tokens": _values_of(_[3], _token_list),
+                "next_tokens": _values_of(_[4], _token_list) if _[4] else [],
+                "next_classes": _values_of(_[5], _class_list) if _[5] else [],
+                "cost": _decompressed_cost(_[6]),
             }
         )
         for _ in _rules
@@ -378,8 +400,8 @@ def decompress_config(compressed_config):
     onmatch_rules = (
         [
             {
-                "prev_classes": [_class_from_id[_] for _ in r[0]],
-                "next_classes": [_class_from_id[_] for _ in r[1]],
+                "prev_classes": _values_of(r[0], _class_list),
+                "next_classes": _values_of(r[1], _class_list),
                 "production": r[2],
             }
             for r in _onmatch_rules
@@ -391,15 +413,25 @@ def decompress_config(compressed_config):
         graph = None
     else:
         [_nodetype_list, _nodes, _edges] = _graph
-        _nodetype_from_id = {i: _ for i, _ in enumerate(_nodetype_list)}
-        node = [decompress_node(_) for _ in _nodes]
-        edge = {
-            int(head_id): {
-                int(tail_id): decompress_edge_data(edge_data)
-                for tail_id, edge_data in tail.items()
+        node = [_decompress_node(_, _token_list, _nodetype_list) for _ in _nodes]
+        if _has_int_keys(_edges):
+            edge = {
+                head_id: {
+                    tail_id: _decompress_edge_data(edge_data, _token_list, _class_list)
+                    for tail_id, edge_data in tail.items()
+                }
+                for head_id, tail in _edges.items()
+            }
+        else:  # keys are strings, e.g. from JSON
+            edge = {
+                int(head_id): {
+                    int(tail_id): _decompress_edge_data(
+                        edge_data, _token_list, _class_list
+                    )
+                    for tail_id, edge_data in tail.items()
+                }
+                for head_id, tail in _edges.items()
             }
-            for head_id, tail in _edges.items()
-        }
         graph = {"node": node, "edge": edge}
     return {
         "tokens": tokens,
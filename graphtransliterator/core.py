@@ -4,20 +4,31 @@
 GraphTransliterator core classes.
 """
 from .ambiguity import check_for_ambiguity
-from .compression import compress_config, decompress_config
+from .compression import (
+    DEFAULT_COMPRESSION_LEVEL,
+    HIGHEST_COMPRESSION_LEVEL,
+    compress_config,
+    decompress_config,
+)
 from .exceptions import (
     IncompleteOnMatchRulesCoverageException,
     IncorrectVersionException,
     NoMatchingTransliterationRuleException,
     UnrecognizableInputTokenException,
 )
-from .graphs import VisitLoggingDirectedGraph, VisitLoggingList
+from .graphs import DirectedGraph, VisitLoggingDirectedGraph, VisitLoggingList
 from .initialize import (
+    _constraint_plans_of,
     _graph_from,
+    _onmatch_rule_of,
+    _onmatch_rules_by_pair_of,
     _onmatch_rules_lookup,
+    _token_indices_of,
+    _token_trie_of,
     _tokenizer_pattern_from,
-    _tokens_by_class_of,
+    _transliteration_rule_of,
     _unescape_charnames,
+    _whitespace_rules_of,
 )
 from .process import _process_easyreading_settings
 from .schemas import (
@@ -28,9 +39,10 @@ from .schemas import (
     TransliterationRuleSchema,
     WhitespaceSettingsSchema,
 )
-from collections import deque
 
 from graphtransliterator import __version__ as __version__
+import copy
+import hashlib
 import json
 import logging
 from marshmallow import (
@@ -41,13 +53,101 @@ from marshmallow import (
     validates_schema,
     ValidationError,
 )
-import re
+import os
+import tempfile
 import yaml
 
 logger = logging.getLogger("graphtransliterator")
 
-DEFAULT_COMPRESSION_LEVEL = 2
-HIGHEST_COMPRESSION_LEVEL = 2
+# Use the libyaml-backed loader, if available, as parsing YAML is slow
+_YAMLSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+TRANSLITERATE_CACHE_SIZE = 4096
+MATCH_CACHE_SIZE = 16384
+YAML_CACHE_SUFFIX = ".cache.json"
+YAML_SETTINGS_CACHE_SIZE = 32
+
+
+_yaml_settings_cache = {}  # parsed settings, by digest of YAML str
+
+
+def _yaml_settings_of(yaml_str, charnames_escaped):
+    """Parse settings from a YAML str."""
+    if charnames_escaped:
+        yaml_str = _unescape_charnames(yaml_str)
+    return yaml.load(yaml_str, Loader=_YAMLSafeLoader)
+
+
+def _cached_yaml_settings_of(yaml_str, charnames_escaped):
+    """
+    Parse settings from a YAML str, caching them by a digest of the str.
+
+    A copy is returned, as settings can end up in a transliterator's metadata.
+    """
+    key = (hashlib.blake2b(yaml_str.encode()).digest(), charnames_escaped)
+    settings = _yaml_settings_cache.get(key)
+    if settings is None:
+        if len(_yaml_settings_cache) >= YAML_SETTINGS_CACHE_SIZE:
+            _yaml_settings_cache.clear()
+        settings = _yaml_settings_cache[key] = _yaml_settings_of(
+            yaml_str, charnames_escaped
+        )
+    return copy.deepcopy(settings)
+
+
+def _cached_yaml_file_settings(yaml_filename, charnames_escaped):
+    """
+    Load settings from a YAML file, using a JSON cache saved alongside it.
+
+    The cache, named with :data:`YAML_CACHE_SUFFIX`, is used if it was made from
+    the current version of the YAML file with the same `charnames_escaped`.
+    Otherwise, the YAML file is parsed and the cache is written, unless the
+    settings would not survive conversion to JSON.
+    """
+    cache_filename = yaml_filename + YAML_CACHE_SUFFIX
+    yaml_mtime = os.stat(yaml_filename).st_mtime_ns
+    try:
+        with open(cache_filename, "r") as f:
+            cached = json.load(f)
+        if (
+            cached["yaml_mtime"] == yaml_mtime
+            and cached["charnames_escaped"] == charnames_escaped
+        ):
+            return cached["settings"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # Missing or unreadable cache
+
+    with open(yaml_filename, "r") as f:
+        settings = _yaml_settings_of(f.read(), charnames_escaped)
+
+    cached = {
+        "yaml_mtime": yaml_mtime,
+        "charnames_escaped": charnames_escaped,
+        "settings": settings,
+    }
+    try:
+        json_str = json.dumps(cached)
+    except (TypeError, ValueError):
+        return settings
+    # JSON would alter some YAML values, such as non-string keys
+    if json.loads(json_str) != cached:
+        return settings
+    # Write to a temporary file first, so the cache is replaced atomically
+    try:
+        fd, temp_filename = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(cache_filename))
+        )
+    except OSError:
+        logger.warning("Could not write YAML cache %s" % cache_filename)
+        return settings
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(json_str)
+        os.replace(temp_filename, cache_filename)
+    except OSError:
+        logger.warning("Could not write YAML cache %s" % cache_filename)
+        os.remove(temp_filename)
+    return settings
 
 
 class GraphTransliteratorSchema(Schema):
@@ -75,6 +175,7 @@ class GraphTransliteratorSchema(Schema):
     tokenizer_pattern = fields.Str(required=False)
     graphtransliterator_version = fields.Str(required=False)
     check_ambiguity = fields.Bool(required=False)
+    cache_matches = fields.Bool(required=False, load_only=True)
     # field for coverage
     coverage = fields.Bool(required=False)
     # compressed_settings = fields.Tuple(required=False)
@@ -175,6 +276,12 @@ class GraphTransliterator:
     graphtransliterator_version: `str`, optional
         Version of graphtransliterator, added by `dump()` and `dumps()`.
 
+    cache_matches: `bool`, optional
+        If true, rules matched during transliteration are cached by their
+        surrounding tokens, which is faster for inputs with repeated words. The
+        default is false. Matches are never cached by
+        :class:`CoverageTransliterator`.
+
     Example
     -------
     .. jupyter-execute::
@@ -191,7 +298,8 @@ class GraphTransliterator:
     from_dict : Constructor from dictionary of settings
     from_easyreading_dict : Constructor from  dictionary in "easy reading" format
     from_yaml : Constructor from YAML string in "easy reading" format
-    from_yaml_file : Constructor from YAML file in "easy reading" format"""  # noqa
+    from_yaml_file : Constructor from YAML file in "easy reading" format
+    from_yaml_stream : Constructor from YAML stream in "easy reading" format"""  # noqa
 
     # ---------- initialize ----------
 
@@ -209,15 +317,28 @@ class GraphTransliterator:
         graph=None,
         tokenizer_pattern=None,
         graphtransliterator_version=None,
+        cache_matches=False,
         **kwargs,
     ):
         self._tokens = tokens
         self._rules = rules
-        self._tokens_by_class = tokens_by_class or _tokens_by_class_of(tokens)
+        # Rule fields used in transliteration, as lists indexed by rule key
+        self._rule_productions = [_.production for _ in rules]
+        self._rule_token_counts = [len(_.tokens) for _ in rules]
+        (
+            _tokens_by_class,
+            self._class_bits,
+            self._token_class_masks,
+        ) = _token_indices_of(tokens)
+        self._tokens_by_class = tokens_by_class or _tokens_by_class
         self._check_ambiguity = check_ambiguity
         if check_ambiguity:
             check_for_ambiguity(self)
         self._whitespace = whitespace
+        # Tokens of the whitespace class, checked during tokenization
+        self._whitespace_tokens = frozenset(
+            _tokens_by_class.get(whitespace.token_class, ())
+        )
 
         if onmatch_rules:
             self._onmatch_rules = onmatch_rules
@@ -227,23 +348,71 @@ class GraphTransliterator:
                 self._onmatch_rules_lookup = _onmatch_rules_lookup(
                     tokens, onmatch_rules
                 )
+            # Flat lookup by (current token, previous token), used in transliterate
+            self._onmatch_rules_by_pair = _onmatch_rules_by_pair_of(
+                self._onmatch_rules_lookup
+            )
+            # Count of previous classes and class bits of previous and next
+            # classes of onmatch rules, for matching in one pass by bitwise AND
+            self._onmatch_class_masks = [
+                (
+                    len(_.prev_classes),
+                    self._class_masks_of(_.prev_classes)
+                    + self._class_masks_of(_.next_classes),
+                )
+                for _ in onmatch_rules
+            ]
         else:
             self._onmatch_rules = None
             self._onmatch_rules_lookup = None
+            self._onmatch_rules_by_pair = None
+            self._onmatch_class_masks = None
 
         self._metadata = metadata
         self._ignore_errors = ignore_errors
 
         if not tokenizer_pattern:
             tokenizer_pattern = _tokenizer_pattern_from(list(tokens.keys()))
+        # The pattern is kept for serialization only. It is not compiled, as
+        # longest-match tokenization is done using a trie of the tokens.
         self._tokenizer_pattern = tokenizer_pattern
-        self._tokenizer = re.compile(tokenizer_pattern, re.S)
+        self._token_trie = _token_trie_of(tokens)
 
         if not graph:
             graph = _graph_from(rules)
         self._graph = graph
+        # Data of the edge leading to each node, as the graph is a tree
+        self._incident_edges = graph.incident_edges()
+        # Children of each node, for use in match_at
+        self._ordered_children = [_.get("ordered_children") for _ in graph.node]
+        # Rule key of each accepting node, or None, for use in match_at
+        self._accepting_rule_keys = [
+            _["rule_key"] if _.get("accepting") else None for _ in graph.node
+        ]
+        # Constraints on the edge leading to each node, planned for match_at
+        self._constraint_plans = _constraint_plans_of(
+            graph, self._rule_token_counts, self._class_bits
+        )
+
+        # Tokens before and after a token index that can affect a match
+        self._match_window = (
+            max(
+                (len(_.prev_classes or ()) + len(_.prev_tokens or ()) for _ in rules),
+                default=0,
+            ),
+            max(
+                (
+                    len(_.tokens) + len(_.next_tokens or ()) + len(_.next_classes or ())
+                    for _ in rules
+                ),
+                default=0,
+            ),
+        )
 
         self._rule_keys = []  # last matched rules
+        self._transliterate_cache = {}  # outputs of transliterate_cached
+        # rule keys matched by transliterate, by window, if caching
+        self._match_cache = {} if cache_matches else None
 
         # When, or if, necessary, add version checking here
         if not graphtransliterator_version:
@@ -254,122 +423,50 @@ class GraphTransliterator:
 
     # ---------- private functions ----------
 
-    def _match_constraints(self, target_edge, curr_node, token_i, tokens):
+    def _match_constraints(self, constraint_plans, token_i, tokens):
         """
-        Match edge constraints.
+        Match edge constraints, as planned by :func:`_constraint_plans_of`.
 
         Called on edge before a rule. `token_i` is set to location right
         after tokens consumed.
 
         """
-        constraints = target_edge.get("constraints")
-        rules = self.rules
-        if not constraints:
+        if not constraint_plans:
             return True
-        for c_type, c_values in constraints.items():
-            if c_type == "prev_tokens":
-                num_tokens = len(rules[curr_node["rule_key"]].tokens)
-                # presume for rule (a) a, with input "aa"
-                # ' ', a, a, ' '  start (token_i=3)
-                #             ^
-                #         ^       -1 subtract num_tokens
-                #      ^          - len(constraint_values)
-                start_at = token_i
-                start_at -= num_tokens
-                start_at -= len(c_values)
-
-                if not self._match_tokens(
-                    start_at,
-                    c_values,
-                    tokens,
-                    check_prev=True,
-                    check_next=False,
-                    by_class=False,
-                ):
-                    return False
-            elif c_type == "next_tokens":
-                # presume for rule a (a), with input "aa"
-                # ' ', a, a, ' '  start (token_i=2)
-                #         ^
-                start_at = token_i
-
-                if not self._match_tokens(
-                    start_at,
-                    c_values,
-                    tokens,
-                    check_prev=False,
-                    check_next=True,
-                    by_class=False,
-                ):
+        token_class_masks = self._token_class_masks
+        for start_offset, c_values, by_class, check_prev in constraint_plans:
+            start_i = token_i + start_offset
+            end_i = start_i + len(c_values)
+            if check_prev:
+                if start_i < 0:
                     return False
-
-            elif c_type == "prev_classes":
-                num_tokens = len(rules[curr_node["rule_key"]].tokens)
-                # presume for rule (a <class_a>) a, with input "aaa"
-                # ' ', a, a, a, ' '
-                #                ^     start (token_i=4)
-                #            ^         -num_tokens
-                #         ^            -len(prev_tokens)
-                #  ^                   -len(prev_classes)
-                start_at = token_i
-                start_at -= num_tokens
-                prev_tokens = constraints.get("prev_tokens")
-                if prev_tokens:
-                    start_at -= len(prev_tokens)
-                start_at -= len(c_values)
-                if not self._match_tokens(
-                    start_at,
-                    c_values,
-                    tokens,
-                    check_prev=True,
-                    check_next=False,
-                    by_class=True,
-                ):
-                    return False
-
-            elif c_type == "next_classes":
-                # presume for rule a (a <class_a>), with input "aaa"
-                # ' ', a, a, a, ' '
-                #         ^          start (token_i=2)
-                #            ^       + len of next_tokens (a)
-                start_at = token_i
-                next_tokens = constraints.get("next_tokens")
-                if next_tokens:
-                    start_at += len(next_tokens)
-                if not self._match_tokens(
-                    start_at,
-                    c_values,
-                    tokens,
-                    check_prev=False,
-                    check_next=True,
-                    by_class=True,
-                ):
-                    return False
-
+            elif end_i > len(tokens):
+                return False
+            if by_class:
+                for i, class_mask in enumerate(c_values, start_i):
+                    if not token_class_masks[tokens[i]] & class_mask:
+                        return False
+            else:
+                for i, c_value in enumerate(c_values, start_i):
+                    if tokens[i] != c_value:
+                        return False
         return True
 
-    def _match_tokens(
-        self,
-        start_i,
-        constraint_values,
-        tokens,
-        check_prev=True,
-        check_next=True,
-        by_class=False,
-    ):
+    def _class_masks_of(self, token_classes):
+        """Convert token classes into a `tuple` of their class bits."""
+        class_bits = self._class_bits
+        return tuple(class_bits[_] for _ in token_classes)
+
+    def _match_class_masks(self, start_i, class_masks, tokens):
         """
-        Match tokens at a particular index, optionally checking previous or next tokens
-        and by token class, with boundary checks."""
+        Match tokens at a particular index against class bits, with boundary
+        checks."""
 
-        if check_prev and start_i < 0:
+        if start_i < 0 or start_i + len(class_masks) > len(tokens):
             return False
-        if check_next and start_i + len(constraint_values) > len(tokens):
-            return False
-        for i in range(0, len(constraint_values)):
-            if by_class:
-                if not constraint_values[i] in self._tokens[tokens[start_i + i]]:
-                    return False
-            elif tokens[start_i + i] != constraint_values[i]:
+        token_class_masks = self._token_class_masks
+        for i, class_mask in enumerate(class_masks, start_i):
+            if not token_class_masks[tokens[i]] & class_mask:
                 return False
         return True
 
@@ -393,6 +490,16 @@ class GraphTransliterator:
     @ignore_errors.setter
     def ignore_errors(self, value):
         self._ignore_errors = value
+        self._transliterate_cache.clear()
+
+    @property
+    def cache_matches(self):
+        """`bool`: Cache matched rules by their surrounding tokens setting."""
+        return self._match_cache is not None
+
+    @cache_matches.setter
+    def cache_matches(self, value):
+        self._match_cache = {} if value else None
 
     @property
     def last_input_tokens(self):
@@ -578,7 +685,7 @@ class GraphTransliterator:
             ),
         }
 
-    def dumps(self, compression_level=2):
+    def dumps(self, compression_level=DEFAULT_COMPRESSION_LEVEL):
         """
 
         Parameters
@@ -701,22 +808,29 @@ class GraphTransliterator:
 
         """  # noqa
 
-        graph = self._graph
-        graph_node = graph.node
-        graph_edge = graph.edge
+        incident_edges = self._incident_edges
+        node_ordered_children = self._ordered_children
+        accepting_rule_keys = self._accepting_rule_keys
+        node_constraint_plans = self._constraint_plans
+        match_constraints = self._match_constraints
+        last_token_i = len(tokens) - 1
         if match_all:
             matches = []
-        stack = deque()
+        stack = []  # LIFO, so the last appended is tried first
+        stack_append = stack.append
+        stack_pop = stack.pop
+
+        node_key = 0  # Start with the root node
 
-        def _append_children(node_key, token_i):
-            children = None
-            ordered_children = graph_node[node_key].get("ordered_children")
+        while True:
+            # Append children of current node to stack
+            ordered_children = node_ordered_children[node_key]
             if ordered_children:
                 children = ordered_children.get(tokens[token_i])
                 if children:
                     # reordered high to low for stack:
                     for child_key in reversed(children):
-                        stack.appendleft((child_key, node_key, token_i))
+                        stack_append((child_key, token_i))
                 else:
                     rules_keys = ordered_children.get("__rules__")  # leafs
                     if rules_keys:
@@ -724,34 +838,35 @@ class GraphTransliterator:
                         # constraints on them.
                         # Reordered so higher cost go on stack last.
                         for rule_key in reversed(rules_keys):
-                            stack.appendleft((rule_key, node_key, token_i))
-
-        _append_children(0, token_i)  # Append all children of root node
-
-        while stack:  # LIFO
-            node_key, parent_key, token_i = stack.popleft()
-
-            curr_node = graph_node[node_key]
-            # Constraints are only on preceding edge if it is accepting
-            # But edge is accessed regardless to test coverage
-            incident_edge = graph_edge[parent_key][node_key]
-            # Pass edge, curr_node, token index, and tokens to check constraints
-            if curr_node.get("accepting") and self._match_constraints(
-                incident_edge, curr_node, token_i, tokens
-            ):
-                if match_all:
-                    matches.append(curr_node["rule_key"])
-                    continue
-                else:
-                    return curr_node["rule_key"]
-            else:
-                if token_i < len(tokens) - 1:
+                            stack_append((rule_key, token_i))
+
+            # Pop nodes (LIFO) until one that is not a match is found
+            while stack:
+                node_key, token_i = stack_pop()
+                rule_key = accepting_rule_keys[node_key]
+                # Constraints are only on preceding edge if it is accepting
+                # But edge is accessed regardless to test coverage
+                incident_edges[node_key]
+                # Only call to check constraints if there are any
+                if rule_key is not None:
+                    constraint_plans = node_constraint_plans[node_key]
+                    if not constraint_plans or match_constraints(
+                        constraint_plans, token_i, tokens
+                    ):
+                        if match_all:
+                            matches.append(rule_key)
+                            continue
+                        return rule_key
+                if token_i < last_token_i:
                     token_i += 1
-                _append_children(node_key, token_i)
+                break
+            else:
+                break
+
         if match_all:
             return matches
 
-    def pruned_of(self, productions):
+    def pruned_of(self, productions, check_ambiguity=None):
         """
         Remove transliteration rules with specific output productions.
 
@@ -759,6 +874,10 @@ class GraphTransliterator:
         ----------
         productions : `str`, or `list` of `str`
             list of productions to remove
+        check_ambiguity : `bool`, optional
+            Check pruned rules for ambiguity. Defaults to the setting of this
+            transliterator. Removing a rule can expose an ambiguity it resolved,
+            so pass `False` only if the removed rules are known not to do so.
 
         Returns
         -------
@@ -768,7 +887,8 @@ class GraphTransliterator:
         Note
         ----
         Uses original initialization parameters to construct a new
-        :class:`GraphTransliterator`.
+        :class:`GraphTransliterator`, reusing lookup tables that do not depend
+        on the rules.
 
         Examples
         --------
@@ -806,7 +926,12 @@ class GraphTransliterator:
             onmatch_rules=self._onmatch_rules,
             metadata=self._metadata,
             ignore_errors=self._ignore_errors,
-            check_ambiguity=self._check_ambiguity,
+            check_ambiguity=(
+                self._check_ambiguity if check_ambiguity is None else check_ambiguity
+            ),
+            onmatch_rules_lookup=self._onmatch_rules_lookup,
+            tokens_by_class=self._tokens_by_class,
+            tokenizer_pattern=self._tokenizer_pattern,
         )
 
     def tokenize(self, input):
@@ -843,31 +968,42 @@ class GraphTransliterator:
 
         """
 
-        def is_whitespace(token):
-            """Check if token is whitespace."""
-            return self.whitespace.token_class in self.tokens[token]
+        whitespace_tokens = self._whitespace_tokens
+        consolidate = self._whitespace.consolidate
 
         # start with a whitespace token
-        tokens = [self.whitespace.default]
+        tokens = [self._whitespace.default]
+        tokens_append = tokens.append
 
         prev_whitespace = True
 
+        token_trie = self._token_trie
+        input_len = len(input)
         match_at = 0
-        while match_at < len(input):
-            match = self._tokenizer.match(input, match_at)
-            if match:
-                match_at = match.end()  # advance match_at
-                token = match.group(0)
-                # Could save match loc here:
-                # matched_at = match.span(0)[0]
-                if is_whitespace(token):
-                    if prev_whitespace and self.whitespace.consolidate:
+        while match_at < input_len:
+            # Find the longest token starting at match_at by walking the trie
+            token = None
+            node = token_trie
+            i = match_at
+            while i < input_len:
+                node = node.get(input[i])
+                if node is None:
+                    break
+                i += 1
+                if "" in node:
+                    token = node[""]
+                    match_end = i
+            if token is not None:
+                match_at = match_end  # advance match_at
+                # Could save match loc here
+                if token in whitespace_tokens:
+                    if prev_whitespace and consolidate:
                         continue
                     else:
                         prev_whitespace = True
                 else:
                     prev_whitespace = False
-                tokens.append(token)
+                tokens_append(token)
             else:
                 logger.warning(
                     "Unrecognizable token %s at pos %s of %s"
@@ -878,11 +1014,11 @@ class GraphTransliterator:
                 else:
                     match_at += 1
 
-        if self.whitespace.consolidate:
-            while len(tokens) > 1 and is_whitespace(tokens[-1]):
+        if consolidate:
+            while len(tokens) > 1 and tokens[-1] in whitespace_tokens:
                 tokens.pop()
 
-        tokens.append(self.whitespace.default)
+        tokens_append(self._whitespace.default)
 
         return tokens
 
@@ -932,12 +1068,36 @@ class GraphTransliterator:
         """
         tokens = self.tokenize(input)  # Adds initial+final whitespace
         self._input_tokens = tokens  # Tokens are saved here
-        self._rule_keys = []  # Matched ule keys are saved here
-        output = ""
+        rule_keys = self._rule_keys = []  # Matched ule keys are saved here
+        rule_keys_append = rule_keys.append
+        output = []  # Productions are joined at the end
+        output_append = output.append
+        rule_productions = self._rule_productions
+        rule_token_counts = self._rule_token_counts
+        match_at = self.match_at
+        match_class_masks = self._match_class_masks
+        onmatch_rules = self._onmatch_rules
+        onmatch_rules_by_pair = self._onmatch_rules_by_pair
+        onmatch_class_masks = self._onmatch_class_masks
+        match_cache = self._match_cache
+        max_prev, max_next = self._match_window
+        last_token_i = len(tokens) - 1
         token_i = 1  # Adjust for initial whitespace
 
-        while token_i < len(tokens) - 1:  # Adjust for final whitespace
-            rule_key = self.match_at(token_i, tokens)
+        while token_i < last_token_i:  # Adjust for final whitespace
+            if match_cache is None:
+                rule_key = match_at(token_i, tokens)
+            else:
+                # Matches depend only on the tokens around token_i, and whether
+                # the input ends within them, so they are cached by that window.
+                start_i = token_i - max_prev if token_i > max_prev else 0
+                end_i = token_i + max_next + 1
+                window = (token_i - start_i, *tokens[start_i:end_i])
+                rule_key = match_cache.get(window, -1)
+                if rule_key == -1:
+                    if len(match_cache) >= MATCH_CACHE_SIZE:
+                        match_cache.clear()
+                    rule_key = match_cache[window] = match_at(token_i, tokens)
             if rule_key is None:
                 logger.warning(
                     "No matching transliteration rule at token pos %s of %s"
@@ -950,42 +1110,86 @@ class GraphTransliterator:
                     continue
                 else:
                     raise NoMatchingTransliterationRuleException
-            self._rule_keys.append(rule_key)
-            rule = self.rules[rule_key]
-            tokens_matched = rule.tokens
-            if self._onmatch_rules:
-                curr_match_rules = None
-                prev_t = tokens[token_i - 1]
-                curr_t = tokens[token_i]
-                curr_t_rules = self._onmatch_rules_lookup.get(curr_t)
-                if curr_t_rules:
-                    curr_match_rules = curr_t_rules.get(prev_t)
+            rule_keys_append(rule_key)
+            if onmatch_rules:
+                curr_match_rules = onmatch_rules_by_pair.get(
+                    (tokens[token_i], tokens[token_i - 1])
+                )
                 if curr_match_rules:
                     for onmatch_i in curr_match_rules:
-                        onmatch = self._onmatch_rules[onmatch_i]
+                        onmatch = onmatch_rules[onmatch_i]
+                        prev_count, class_masks = onmatch_class_masks[onmatch_i]
                         # <class_a> <class_a> + <class_b>
                         # a a b
                         #     ^
-                        # ^      - len(onmatch.prev_rules)
-                        if self._match_tokens(
-                            token_i - len(onmatch.prev_classes),
-                            onmatch.prev_classes,  # Checks last value
-                            tokens,
-                            check_prev=True,
-                            check_next=False,
-                            by_class=True,
-                        ) and self._match_tokens(
-                            token_i,
-                            onmatch.next_classes,  # Checks first value
-                            tokens,
-                            check_prev=False,
-                            check_next=True,
-                            by_class=True,
+                        # ^      - len(onmatch.prev_classes)
+                        if match_class_masks(
+                            token_i - prev_count, class_masks, tokens
                         ):
-                            output += onmatch.production
+                            output_append(onmatch.production)
                             break  # Only match best onmatch rule
-            output += rule.production
-            token_i += len(tokens_matched)
+            output_append(rule_productions[rule_key])
+            token_i += rule_token_counts[rule_key]
+        return "".join(output)
+
+    def transliterate_many(self, inputs):
+        """
+        Transliterate a sequence of input strings.
+
+        Each input is tokenized and matched separately, so rules never match
+        across inputs. Repeated inputs are only transliterated once.
+
+        Parameters
+        ----------
+        inputs : iterable of `str`
+            Input strings to transliterate
+
+        Returns
+        -------
+        `list` of `str`
+            Transliteration output strings
+
+        Note
+        ----
+        Afterwards, :attr:`last_input_tokens` and related properties refer to
+        the last input that was not a repeat.
+        """
+        transliterate = self.transliterate
+        inputs = list(inputs)
+        outputs = {}
+        for _ in inputs:
+            if _ not in outputs:
+                outputs[_] = transliterate(_)
+        return [outputs[_] for _ in inputs]
+
+    def transliterate_cached(self, input):
+        """
+        Transliterate an input string, caching the output for repeated inputs.
+
+        Up to ``TRANSLITERATE_CACHE_SIZE`` outputs are cached, after which the
+        cache is cleared. Changing :attr:`ignore_errors` also clears the cache.
+
+        Parameters
+        ----------
+        input : `str`
+            Input string to transliterate
+
+        Returns
+        -------
+        `str`
+            Transliteration output string
+
+        Note
+        ----
+        If the output is cached, :attr:`last_input_tokens` and related properties
+        are not updated.
+        """
+        cache = self._transliterate_cache
+        output = cache.get(input)
+        if output is None:
+            if len(cache) >= TRANSLITERATE_CACHE_SIZE:
+                cache.clear()
+            output = cache[input] = self.transliterate(input)
         return output
 
     # ---------- static methods ----------
@@ -1014,6 +1218,7 @@ class GraphTransliterator:
             "tokenizer_pattern": settings.get("tokenizer_pattern"),  # will be generated
             "ignore_errors": kwargs.get("ignore_errors", False),
             "check_ambiguity": kwargs.get("check_ambiguity", True),
+            "cache_matches": kwargs.get("cache_matches", False),
         }
         return GraphTransliterator(*args, **kwargs)
 
@@ -1110,7 +1315,8 @@ class GraphTransliterator:
 
         Note
         ----
-        Called by :meth:`from_yaml_file` and calls :meth:`from_easyreading_dict`.
+        Calls :meth:`from_easyreading_dict`. Parsed YAML is cached, so repeated
+        calls with the same `yaml_str` only rebuild the transliterator.
 
         Example
         -------
@@ -1140,15 +1346,12 @@ class GraphTransliterator:
         from_yaml : Constructor from YAML string in "easy reading" format
         from_yaml_file : Constructor from YAML file in "easy reading" format
         """
-        if charnames_escaped:
-            yaml_str = _unescape_charnames(yaml_str)
-
-        settings = yaml.safe_load(yaml_str)
+        settings = _cached_yaml_settings_of(yaml_str, charnames_escaped)
 
         return GraphTransliterator.from_easyreading_dict(settings, **kwargs)
 
     @staticmethod
-    def from_yaml_file(yaml_filename, **kwargs):
+    def from_yaml_file(yaml_filename, charnames_escaped=True, cache=False, **kwargs):
         """
         Construct GraphTransliterator from YAML file.
 
@@ -1157,20 +1360,64 @@ class GraphTransliterator:
         yaml_filename : str
             Name of YAML file, containing tokens, rules, and (optionally)
             onmatch_rules
+        charnames_escaped : boolean
+            Unescape Unicode during YAML read (default True)
+        cache : boolean
+            Cache the parsed YAML as JSON in a file alongside the YAML file,
+            named with the suffix ``.cache.json``, and load it from there while
+            the YAML file is unchanged (default False)
 
         Note
         ----
-        Calls :meth:`from_yaml`.
+        Calls :meth:`from_yaml_stream` or, if `cache` is `True`,
+        :meth:`from_easyreading_dict`.
 
         See Also
         --------
         from_yaml : Constructor from YAML string in "easy reading" format
+        from_yaml_stream : Constructor from YAML stream in "easy reading" format
         from_easyreading_dict : Constructor from dictionary in "easy reading" format
         """
+        if cache:
+            settings = _cached_yaml_file_settings(yaml_filename, charnames_escaped)
+            return GraphTransliterator.from_easyreading_dict(settings, **kwargs)
+
         with open(yaml_filename, "r") as f:
-            yaml_string = f.read()
+            return GraphTransliterator.from_yaml_stream(
+                f, charnames_escaped=charnames_escaped, **kwargs
+            )
 
-        return GraphTransliterator.from_yaml(yaml_string, **kwargs)
+    @staticmethod
+    def from_yaml_stream(yaml_stream, charnames_escaped=True, **kwargs):
+        """
+        Construct GraphTransliterator from a YAML stream.
+
+        Parameters
+        ----------
+        yaml_stream : file-like object
+            Readable stream of YAML mappings of tokens, rules, and (optionally)
+            onmatch_rules
+        charnames_escaped : boolean
+            Unescape Unicode during YAML read (default True)
+
+        Note
+        ----
+        Called by :meth:`from_yaml_file` and calls :meth:`from_easyreading_dict`.
+        If `charnames_escaped` is `True`, the stream is read into a string to be
+        unescaped. Otherwise, it is parsed directly. Unlike :meth:`from_yaml`,
+        parsed YAML is not cached.
+
+        See Also
+        --------
+        from_yaml : Constructor from YAML string in "easy reading" format
+        from_yaml_file : Constructor from YAML file in "easy reading" format
+        """
+        if charnames_escaped:
+            settings = _yaml_settings_of(yaml_stream.read(), charnames_escaped)
+        else:
+            settings = yaml.load(yaml_stream, Loader=_YAMLSafeLoader)
+
+        return GraphTransliterator.from_easyreading_dict(settings, **kwargs)
 
     @staticmethod
     def load(settings, **kwargs):
@@ -1328,6 +1575,76 @@ class GraphTransliterator:
 
         return GraphTransliteratorSchema().load(_settings)
 
+    @staticmethod
+    def loads_trusted(settings, **kwargs):
+        """Create GraphTransliterator from a trusted JSON string, without validation.
+
+        Unlike :meth:`loads`, settings are not validated by the schema, so this
+        should only be used with JSON produced by :meth:`dumps`, such as that of
+        bundled transliterators. Ambiguity is not checked.
+
+        Parameters
+        ----------
+        settings
+            JSON settings for GraphTransliterator, as produced by :meth:`dumps`
+
+        Returns
+        -------
+        GraphTransliterator
+            Graph Transliterator
+
+        See Also
+        --------
+        loads : Load Graph Transliteration from configuration as a JSON string
+        """
+        return GraphTransliterator._from_validated_dict(
+            dict(json.loads(settings), **kwargs)
+        )
+
+    @staticmethod
+    def _from_validated_dict(settings):
+        """Create GraphTransliterator from settings assumed to be schema-correct."""
+        version = settings.get("graphtransliterator_version")
+        if version and version > __version__:
+            raise IncorrectVersionException
+        compressed_settings = settings.get("compressed_settings")
+        if compressed_settings:
+            settings = dict(settings, **decompress_config(compressed_settings))
+        onmatch_rules = settings.get("onmatch_rules")
+        tokens_by_class = settings.get("tokens_by_class")
+        graph = settings.get("graph")
+        if graph:
+            # JSON object keys are strings, but edges are keyed by node index
+            graph = DirectedGraph(
+                node=graph["node"],
+                edge={
+                    int(head): {int(tail): data for tail, data in tails.items()}
+                    for head, tails in graph["edge"].items()
+                },
+                edge_list=[tuple(_) for _ in graph.get("edge_list", [])],
+            )
+        return GraphTransliterator(
+            {k: set(v) for k, v in settings["tokens"].items()},
+            [_transliteration_rule_of(_) for _ in settings["rules"]],
+            _whitespace_rules_of(settings["whitespace"]),
+            onmatch_rules=(
+                [_onmatch_rule_of(_) for _ in onmatch_rules] if onmatch_rules else None
+            ),
+            metadata=settings.get("metadata"),
+            ignore_errors=settings.get("ignore_errors", False),
+            check_ambiguity=False,
+            onmatch_rules_lookup=settings.get("onmatch_rules_lookup"),
+            tokens_by_class=(
+                {k: set(v) for k, v in tokens_by_class.items()}
+                if tokens_by_class
+                else None
+            ),
+            graph=graph,
+            tokenizer_pattern=settings.get("tokenizer_pattern"),
+            graphtransliterator_version=version,
+            cache_matches=settings.get("cache_matches", False),
+        )
+
 
 class CoverageTransliterator(GraphTransliterator):
     """Subclass of GraphTransliterator that logs visits to graph and on_match rules.
@@ -1339,7 +1656,30 @@ class CoverageTransliterator(GraphTransliterator):
         GraphTransliterator.__init__(self, *args, **kwargs)
         # Convert  _graph and _onmatch_rules to visit-tracking objects
         self._graph = VisitLoggingDirectedGraph(self._graph)
+        self._incident_edges = self._graph.incident_edges()
+        self._ordered_children = self._graph.node_values(self._ordered_children)
+        self._accepting_rule_keys = self._graph.node_values(self._accepting_rule_keys)
         self._onmatch_rules = VisitLoggingList(self._onmatch_rules)
+        self._match_cache = None  # so that every match visits the graph
+        if kwargs.get("cache_matches"):
+            self._warn_cache_matches()
+
+    @property
+    def cache_matches(self):
+        """`bool`: Cache matched rules setting, always false if logging visits."""
+        return self._match_cache is not None
+
+    @cache_matches.setter
+    def cache_matches(self, value):
+        # Bundled transliterators subclass this but may not log visits
+        if value and isinstance(self._graph, VisitLoggingDirectedGraph):
+            self._warn_cache_matches()
+            return
+        self._match_cache = {} if value else None
+
+    @staticmethod
+    def _warn_cache_matches():
+        logger.warning("Matches are not cached when checking coverage.")
 
     def clear_visited(self):
         """Clear visited flags from graph and onmatch_rules."""
@@ -116,6 +116,35 @@ class DirectedGraph:
 
         return self.edge[head][tail]
 
+    def incident_edges(self):
+        """Return data of the edge leading to each node, indexed by node.
+
+        The graph is assumed to be a tree, as each node of a transliteration
+        graph has at most one incoming edge. Nodes without one, such as the root,
+        have `None`.
+
+        Returns
+        -------
+        `list` of `dict` or `None`
+            Data of the incoming edge of each node
+
+        Examples
+        --------
+        .. jupyter-execute::
+
+          g = DirectedGraph()
+          g.add_node()
+          g.add_node()
+          g.add_edge(0, 1, {'cost': 0.5})
+          g.incident_edges()
+
+        """
+        incident_edges = [None] * len(self.node)
+        for tails in self.edge.values():
+            for tail, edge_data in tails.items():
+                incident_edges[tail] = edge_data
+        return incident_edges
+
     def add_node(self, node_data=None):
         """Create node and return (`int`, `dict`) of node key and object.
 
@@ -189,6 +218,42 @@ class VisitLoggingDict(UserDict):
         self.visited.clear()
 
 
+class VisitLoggingIncidentEdges:
+    """Incident edges of a VisitLoggingDirectedGraph, indexed by tail.
+
+    Accesses edges through the graph so that their visits are logged."""
+
+    __slots__ = "edge", "head_of"
+
+    def __init__(self, graph):
+        self.edge = graph.edge
+        # Access data to not mark visited
+        self.head_of = {
+            tail: head
+            for head, tails in graph.edge.data.items()
+            for tail in tails.data.keys()
+        }
+
+    def __getitem__(self, tail):
+        return self.edge[self.head_of[tail]][tail]
+
+
+class VisitLoggingNodeValues:
+    """Values derived from each node of a VisitLoggingDirectedGraph, indexed by node.
+
+    Accesses nodes through the graph so that their visits are logged."""
+
+    __slots__ = "node", "values"
+
+    def __init__(self, graph, values):
+        self.node = graph.node
+        self.values = values
+
+    def __getitem__(self, node_key):
+        self.node[node_key]
+        return self.values[node_key]
+
+
 class VisitLoggingDirectedGraph(DirectedGraph):
     """A DirectedGraph that logs visits to all nodes and edges.
 
@@ -210,6 +275,14 @@ class VisitLoggingDirectedGraph(DirectedGraph):
         super().__init__(edge=graph.edge, node=graph.node, edge_list=graph.edge_list)
         self._add_visit_logging()
 
+    def incident_edges(self):
+        """Return incident edges of each node that log visits to edges."""
+        return VisitLoggingIncidentEdges(self)
+
+    def node_values(self, values):
+        """Return values derived from each node that log visits to nodes."""
+        return VisitLoggingNodeValues(self, values)
+
     def clear_visited(self):
         """Clear all visited attributes on nodes and edges."""
         self.node.visited.clear()
@@ -6,6 +6,7 @@ Functions used to initialize a GraphTransliterator.
 from .graphs import DirectedGraph
 from .rules import TransliterationRule, WhitespaceRules, OnMatchRule
 from collections import defaultdict
+import functools
 import math
 import re
 import unicodedata
@@ -14,14 +15,32 @@ import unicodedata
 # ---------- initialize tokens ----------
 
 
-def _tokens_by_class_of(tokens):
-    """Generates lookup table of tokens in each class."""
+def _token_indices_of(tokens):
+    """Generates lookup tables of token classes in a single pass over tokens.
 
-    out = defaultdict(set)
+    Each token class is assigned a bit, ordered by class name. A token's mask is the
+    bitwise OR of the bits of its classes, so membership of a token in a class is a
+    single bitwise AND.
+
+    Returns
+    -------
+    `tuple` of (`dict`, `dict`, `dict`)
+        Tokens in each class ({`str`: `set` of `str`}), bit of each token class
+        ({`str`: `int`}), and mask of classes of each token ({`str`: `int`})
+    """
+
+    tokens_by_class = defaultdict(set)
     for token, token_classes in tokens.items():
         for token_class in token_classes:
-            out[token_class].add(token)
-    return out
+            tokens_by_class[token_class].add(token)
+
+    class_bits = {}
+    token_class_masks = dict.fromkeys(tokens, 0)
+    for i, token_class in enumerate(sorted(tokens_by_class)):
+        class_bit = class_bits[token_class] = 1 << i
+        for token in tokens_by_class[token_class]:
+            token_class_masks[token] |= class_bit
+    return tokens_by_class, class_bits, token_class_masks
 
 
 # ---------- initialize rules ----------
@@ -107,6 +126,23 @@ def _onmatch_rules_lookup(tokens, onmatch_rules):
     return onmatch_lookup
 
 
+def _onmatch_rules_by_pair_of(onmatch_rules_lookup):
+    """Flattens onmatch rules lookup into a single lookup table.
+
+    Returns
+    -------
+    dict of {tuple of (str, str): tuple of int}
+        Dictionary keyed by current and previous token containing a tuple of indexes
+        of :class:`OnMatchRule` in order that would apply
+    """
+
+    return {
+        (curr_token, prev_token): tuple(rule_list)
+        for curr_token, prev_tokens in onmatch_rules_lookup.items()
+        for prev_token, rule_list in prev_tokens.items()
+    }
+
+
 # ---------- initialize whitespace ---------
 
 
@@ -133,6 +169,22 @@ def _tokenizer_pattern_from(tokens):
     return regex_str
 
 
+def _token_trie_of(tokens):
+    """Generates a character trie of tokens used for tokenization.
+
+    Each node is a `dict` keyed by the next character. A node ending a token stores
+    the token under the empty string key, which no character can match.
+    """
+
+    trie = {}
+    for token in tokens:
+        node = trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[""] = token
+    return trie
+
+
 # ---------- initialize graph ----------
 
 
@@ -232,8 +284,76 @@ def _graph_from(rules):
     return graph
 
 
+def _constraint_plans_of(graph, rule_token_counts, class_bits):
+    """Generates plans to match the constraints on the edge leading to each node.
+
+    Constraints are only on the edge before a rule, and their position relative to
+    the index after the rule's tokens is fixed. Each constraint is planned as a
+    `tuple` of its start offset from that index, its tokens or class masks, whether
+    to match by class, and whether it precedes the rule. Nodes without constraints
+    have `None`.
+
+    Returns
+    -------
+    `list` of (`tuple` of `tuple`) or `None`
+        Constraint plans of each node
+    """
+
+    plans = []
+    for node, edge in zip(graph.node, graph.incident_edges()):
+        constraints = edge.get("constraints") if edge else None
+        if not constraints or "rule_key" not in node:
+            plans.append(None)
+            continue
+        num_tokens = rule_token_counts[node["rule_key"]]
+        prev_tokens = constraints.get("prev_tokens") or ()
+        next_tokens = constraints.get("next_tokens") or ()
+        node_plans = []
+        for c_type, c_values in constraints.items():
+            if c_type == "prev_tokens":
+                # presume for rule (a) a, with input "aa"
+                # ' ', a, a, ' '  start (token_i=3)
+                #             ^
+                #         ^       -1 subtract num_tokens
+                #      ^          - len(constraint_values)
+                start_offset = -num_tokens - len(c_values)
+                node_plans.append((start_offset, tuple(c_values), False, True))
+            elif c_type == "next_tokens":
+                # presume for rule a (a), with input "aa"
+                # ' ', a, a, ' '  start (token_i=2)
+                #         ^
+                node_plans.append((0, tuple(c_values), False, False))
+            elif c_type == "prev_classes":
+                # presume for rule (a <class_a>) a, with input "aaa"
+                # ' ', a, a, a, ' '
+                #                ^     start (token_i=4)
+                #            ^         -num_tokens
+                #         ^            -len(prev_tokens)
+                #  ^                   -len(prev_classes)
+                start_offset = -num_tokens - len(prev_tokens) - len(c_values)
+                class_masks = tuple(class_bits[_] for _ in c_values)
+                node_plans.append((start_offset, class_masks, True, True))
+            elif c_type == "next_classes":
+                # presume for rule a (a <class_a>), with input "aaa"
+                # ' ', a, a, a, ' '
+                #         ^          start (token_i=2)
+                #            ^       + len of next_tokens (a)
+                class_masks = tuple(class_bits[_] for _ in c_values)
+                node_plans.append((len(next_tokens), class_masks, True, False))
+        plans.append(tuple(node_plans))
+    return plans
+
+
 # ---------- unicode adjustiments during initialization ----------
 
+_CHARNAME_RE = re.compile(r"\\N{([-A-Z ]+)}")
+
+
+@functools.lru_cache(maxsize=4096)
+def _char_of_charname(charname):
+    """Get Unicode character of a character name, cached as names often repeat."""
+    return unicodedata.lookup(charname)  # KeyError if invalid
+
 
 def _unescape_charnames(input_str):
     r"""
@@ -260,9 +380,6 @@ def _unescape_charnames(input_str):
 
     def get_unicode_char(matchobj):
         """Get Unicode character value from escaped character sequences."""
-        charname = matchobj.group(0)
-        match = re.match(r"\\N{([-A-Z ]+)}", charname)
-        char = unicodedata.lookup(match.group(1))  # KeyError if invalid
-        return char
+        return _char_of_charname(matchobj.group(1))
 
-    return re.sub(r"\\N{[-A-Z ]+}", get_unicode_char, input_str)
+    return _CHARNAME_RE.sub(get_unicode_char, input_str)
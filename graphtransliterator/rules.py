@@ -4,23 +4,81 @@
 Graph Transliterator rule classes.
 """
 
-from collections import namedtuple
-
-
-class TransliterationRule(
-    namedtuple(
-        "TransliterationRule",
-        [
-            "production",
-            "prev_classes",
-            "prev_tokens",
-            "tokens",
-            "next_tokens",
-            "next_classes",
-            "cost",
-        ],
-    )
-):
+import sys
+
+
+def _intern(production):
+    """Intern production, if it is a `str`."""
+    return sys.intern(production) if type(production) is str else production
+
+
+class _Rule:
+    """
+    Base class for rules, with fields stored in ``__slots__``.
+
+    Provides the tuple-like behavior of a `namedtuple` (iteration, unpacking,
+    indexing, equality, immutability, ``_fields``, ``_asdict()``, and
+    ``_replace()``) while keeping attribute access fast, as rules are accessed in
+    the transliteration loop.
+
+    Fields are set in ``__new__`` from the values returned by the subclass's
+    ``_values_of``. Pickles of rules from when they were namedtuples (protocol 2
+    and above) only call ``__new__``, so they still load.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls)
+        for field, value in zip(cls._fields, cls._values_of(*args, **kwargs)):
+            object.__setattr__(self, field, value)
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("can't set attribute")
+
+    def __delattr__(self, name):
+        raise AttributeError("can't delete attribute")
+
+    def __iter__(self):
+        return (getattr(self, _) for _ in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(getattr(self, _) for _ in self._fields[i])
+        return getattr(self, self._fields[i])
+
+    def __eq__(self, other):
+        if isinstance(other, (_Rule, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join("{}={!r}".format(_, getattr(self, _)) for _ in self._fields),
+        )
+
+    def __reduce__(self):
+        return (type(self), tuple(self))
+
+    def _asdict(self):
+        """Return a new `dict` mapping field names to their values."""
+        return {_: getattr(self, _) for _ in self._fields}
+
+    def _replace(self, **kwargs):
+        """Return a new rule replacing specified fields with new values."""
+        return type(self)(**dict(self._asdict(), **kwargs))
+
+
+class TransliterationRule(_Rule):
     """
     A transliteration rule containing the specific match conditions and
     string output to be produced, as well as the rule's cost.
@@ -44,12 +102,40 @@ class TransliterationRule(
         Cost of the rule, where less specific rules are more costly
     """
 
-    __slots__ = ()
+    _fields = (
+        "production",
+        "prev_classes",
+        "prev_tokens",
+        "tokens",
+        "next_tokens",
+        "next_classes",
+        "cost",
+    )
+    __slots__ = _fields
+
+    @staticmethod
+    def _values_of(
+        production,
+        prev_classes,
+        prev_tokens,
+        tokens,
+        next_tokens,
+        next_classes,
+        cost,
+    ):
+        # Interned, as productions are often repeated across rules
+        return (
+            _intern(production),
+            prev_classes,
+            prev_tokens,
+            tokens,
+            next_tokens,
+            next_classes,
+            cost,
+        )
 
 
-class OnMatchRule(
-    namedtuple("OnMatchRule", ["prev_classes", "next_classes", "production"])
-):
+class OnMatchRule(_Rule):
     """
     Rules about adding text between certain combinations of matched rules.
 
@@ -67,12 +153,15 @@ class OnMatchRule(
         String to added before current rule
     """
 
-    __slots__ = ()
+    _fields = ("prev_classes", "next_classes", "production")
+    __slots__ = _fields
+
+    @staticmethod
+    def _values_of(prev_classes, next_classes, production):
+        return (prev_classes, next_classes, _intern(production))
 
 
-class WhitespaceRules(
-    namedtuple("Whitespace", ["default", "token_class", "consolidate"])
-):
+class WhitespaceRules(_Rule):
     """
     Whitespace rules of GraphTransliterator.
 
@@ -87,4 +176,8 @@ class WhitespaceRules(
         instance of the specified default whitespace token.
     """
 
-    __slots__ = ()
+    __slots__ = _fields = ("default", "token_class", "consolidate")
+
+    @staticmethod
+    def _values_of(default, token_class, consolidate):
+        return (default, token_class, consolidate)
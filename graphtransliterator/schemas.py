@@ -141,7 +141,7 @@ class SettingsSchema(Schema):
     @validates_schema
     def validate_token_classes(self, data, **kwargs):
         errors = defaultdict(list)
-        token_classes = list(set().union(*data["tokens"].values()))
+        token_classes = set().union(*data["tokens"].values())
 
         # Validate onmatch_rules and rules
         for rule_type in ("onmatch_rules", "rules"):
@@ -1,5 +1,9 @@
 from collections import OrderedDict
-from graphtransliterator.core import GraphTransliterator, CoverageTransliterator
+from graphtransliterator.core import (
+    CoverageTransliterator,
+    GraphTransliterator,
+    _YAMLSafeLoader,
+)
 import os
 import sys
 import yaml
@@ -39,7 +43,11 @@ class Bundled(CoverageTransliterator, GraphTransliterator):
             gt = GraphTransliterator.from_yaml_file(filename, **kwargs)
         elif method == "json":
             with open(filename, "r") as f:
-                gt = GraphTransliterator.loads(f.read(), **kwargs)
+                # Bundled JSON is trusted, so skip validation unless checking
+                if kwargs.get("check_ambiguity"):
+                    gt = GraphTransliterator.loads(f.read(), **kwargs)
+                else:
+                    gt = GraphTransliterator.loads_trusted(f.read(), **kwargs)
         # Select coverage superclass, if coverage set.
         if kwargs.get("coverage"):
             _super = CoverageTransliterator
@@ -59,6 +67,7 @@ class Bundled(CoverageTransliterator, GraphTransliterator):
             graph=gt._graph,
             tokenizer_pattern=gt._tokenizer_pattern,
             graphtransliterator_version=gt._graphtransliterator_version,
+            cache_matches=kwargs.get("cache_matches", False),
             coverage=kwargs.get("coverage", True),
         )
 
@@ -71,6 +80,9 @@ class Bundled(CoverageTransliterator, GraphTransliterator):
             Should ambiguity be checked. Default is `True.`
         coverage: `bool`
             Should test coverage be checked. Default is `True`.
+        cache_matches: `bool`
+            Should matched rules be cached. Ignored, with a warning, if
+            coverage is checked. Default is `False`.
         """
         self._init_from(
             method="yaml", check_ambiguity=check_ambiguity, coverage=coverage, **kwargs
@@ -85,7 +97,10 @@ class Bundled(CoverageTransliterator, GraphTransliterator):
         check_ambiguity: `bool`,
             Should ambiguity be checked. Default is `False.`
         coverage: `bool`
-            Should test coverage be checked. Default is `False`."""
+            Should test coverage be checked. Default is `False`.
+        cache_matches: `bool`
+            Should matched rules be cached. Ignored, with a warning, if
+            coverage is checked. Default is `False`."""
         self._init_from(
             method="json", check_ambiguity=check_ambiguity, coverage=coverage, **kwargs
         )
@@ -121,7 +136,8 @@ class Bundled(CoverageTransliterator, GraphTransliterator):
         """
         test_file = self.yaml_tests_filen
         with open(test_file, "r") as f:
-            return {str(k): str(i) for k, i in yaml.safe_load(f).items()}
+            tests = yaml.load(f, Loader=_YAMLSafeLoader)
+        return {str(k): str(i) for k, i in tests.items()}
 
     def run_tests(self, transliteration_tests):
         """Run transliteration tests.
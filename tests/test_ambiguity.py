@@ -9,8 +9,10 @@ from graphtransliterator import (
     GraphTransliterator,
     TransliterationRule,
 )
-from graphtransliterator.ambiguity import _easyreading_rule
+from graphtransliterator import ambiguity
+from graphtransliterator.ambiguity import _easyreading_rule, check_for_ambiguity
 import pytest
+from unittest import mock
 
 
 def test_GraphParser_check_ambiguity():
@@ -71,3 +73,50 @@ def test_GraphTransliterator_easy_reading():
         _easyreading_rule(TransliterationRule("", ["class_a"], ["b"], ["a"], ["b"], ["class_a"], 0))
         == "(<class_a> b) a (b <class_a>)"
     )
+
+
+def test_check_for_ambiguity_distinct_costs():
+    """Test that rules of distinct costs are not checked pairwise."""
+    gt = GraphTransliterator.from_yaml(
+        """
+        tokens:
+          a: []
+          ' ': [wb]
+        rules:
+          a: A
+          a a: AA
+        whitespace:
+          default: ' '
+          token_class: wb
+          consolidate: true
+        """,
+        check_ambiguity=False,
+    )
+    with mock.patch.object(
+        ambiguity, "_full_intersection", wraps=ambiguity._full_intersection
+    ) as full_intersection:
+        check_for_ambiguity(gt)
+    full_intersection.assert_not_called()
+    # rules of the same cost are checked pairwise
+    gt = GraphTransliterator.from_yaml(
+        """
+        tokens:
+          a: [class_a]
+          ' ': [wb]
+        rules:
+          <class_a> a: _A
+          a <class_a>: A_
+          a: A
+        whitespace:
+          default: ' '
+          token_class: wb
+          consolidate: true
+        """,
+        check_ambiguity=False,
+    )
+    with mock.patch.object(
+        ambiguity, "_full_intersection", wraps=ambiguity._full_intersection
+    ) as full_intersection:
+        with pytest.raises(AmbiguousTransliterationRulesException):
+            check_for_ambiguity(gt)
+    full_intersection.assert_called()
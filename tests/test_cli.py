@@ -162,3 +162,12 @@ def test_command_line_version():
     runner = CliRunner()
     version_result = runner.invoke(cli.main, ["--version"])
     assert f"{version}" in version_result.output
+
+
+def test_load_transliterator_fresh_instances():
+    """Test that each load returns a separate transliterator."""
+    first = cli.load_transliterator(["bundled", "Example"])
+    first.ignore_errors = True
+    second = cli.load_transliterator(["bundled", "Example"])
+    assert second is not first
+    assert second.ignore_errors is False
@@ -42,3 +42,18 @@ def test_CoverageTransliterator():
     with pytest.raises(IncompleteGraphCoverageException):
         covt.clear_visited()
         covt.check_coverage()
+
+
+def test_CoverageTransliterator_cache_matches(caplog):
+    """Test that coverage transliterators do not cache matches."""
+    covt = transliterators.Example(coverage=True, cache_matches=True)
+    assert not covt.cache_matches
+    covt.cache_matches = True
+    assert not covt.cache_matches
+    assert "not cached" in caplog.text
+    for _ in range(2):
+        covt.clear_visited()
+        assert covt.transliterate("babab") == "BA!B!AB"
+        assert covt.transliterate("aa ") == "A,A "
+        assert covt.check_coverage()
+    assert transliterators.Example(coverage=False, cache_matches=True).cache_matches
@@ -6,6 +6,7 @@
 from graphtransliterator import process
 from graphtransliterator.core import GraphTransliterator
 from graphtransliterator.exceptions import (
+    AmbiguousTransliterationRulesException,
     IncorrectVersionException,
     NoMatchingTransliterationRuleException,
     UnrecognizableInputTokenException,
@@ -14,7 +15,11 @@ from graphtransliterator.graphs import DirectedGraph
 from graphtransliterator.rules import OnMatchRule, TransliterationRule, WhitespaceRules
 from itertools import combinations
 from marshmallow import ValidationError
+from unittest import mock
+import copyreg
 import graphtransliterator
+import io
+import json
 import pytest
 import re
 import yaml
@@ -216,6 +221,19 @@ def test_graphtransliterator_models():
         cost=1,
     )
     assert tr.cost == 1
+    # rules keep the tuple-like behavior of namedtuples
+    assert tr == ("A", None, None, ["a"], None, None, 1)
+    assert tr._asdict()["tokens"] == ["a"]
+    assert tr._replace(cost=2).cost == 2
+    production, *_, cost = tr
+    assert (production, cost) == ("A", 1)
+    assert tr[0] == "A" and tr[-1] == 1 and tr[2:4] == (None, ["a"])
+    # and are immutable
+    with pytest.raises(AttributeError):
+        tr.cost = 2
+    assert tr.cost == 1
+    # rules pickled as namedtuples, which only call __new__, still load
+    assert copyreg.__newobj__(TransliterationRule, *tr) == tr
     # assert TransliteratorOutput([tr], 'A').output == 'A'
     assert OnMatchRule(prev_classes=["class1"], next_classes=["class2"], production=",")
     assert WhitespaceRules(default=" ", token_class="wb", consolidate=False)
@@ -239,6 +257,8 @@ def test_graphtransliterator_structures():
     assert graph.edge[0][1]["type"] == "edge_test1"
     # test add_edge with no edge data
     graph.add_edge(1, 2)
+    # test incident_edges
+    assert graph.incident_edges() == [None, {"type": "edge_test1"}, {}]
     # edge tail not in graph
     with pytest.raises(ValueError):
         graph.add_edge(0, 7, {})
@@ -337,6 +357,22 @@ def test_GraphTransliterator_transliterate(tmpdir):
     # test last_matched_rules
     assert len(gt.last_matched_rules) == 4
 
+    # test transliterate_many
+    assert gt.transliterate_many(["a", "ab", "a"]) == ["A", "A,B", "A"]
+    assert gt.last_matched_rule_tokens == [["a"], ["b"]]
+
+    # test transliterate_cached
+    assert gt.transliterate_cached("ab") == "A,B"
+    with mock.patch.object(gt, "transliterate") as transliterate:
+        assert gt.transliterate_cached("ab") == "A,B"
+    transliterate.assert_not_called()
+    gt.ignore_errors = True
+    ignored = gt.transliterate_cached("ab&")
+    assert ignored == gt.transliterate_cached("ab&") == "A,B"
+    gt.ignore_errors = False  # cached output is not reused
+    with pytest.raises(UnrecognizableInputTokenException):
+        gt.transliterate_cached("ab&")
+
 
 def test_serialization():
     """Test serialization of graphtransliterator"""
@@ -407,6 +443,14 @@ def test_serialization():
     _["graphtransliterator_version"] += "1"  # add 1 e.g. 1.0.11
     with pytest.raises(IncorrectVersionException):
         assert GraphTransliterator.load(_)
+    # test loads_trusted at all compression levels
+    for compression_level in range(3):
+        x = gt.dumps(compression_level=compression_level)
+        trusted_gt = GraphTransliterator.loads_trusted(x)
+        assert trusted_gt.dump() == GraphTransliterator.loads(x).dump()
+        assert trusted_gt.transliterate("a aa") == "A A,A"
+    with pytest.raises(IncorrectVersionException):
+        assert GraphTransliterator.loads_trusted(json.dumps(_))
 
 
 def test_version():
@@ -485,7 +529,40 @@ def test_GraphTransliterator(tmpdir):
     assert len(set(GraphTransliterator.from_easyreading_dict(input_dict).tokens)) == 4
 
     assert GraphTransliterator.from_yaml(yaml_str).transliterate("ab") == "A,B"
+    # parsed YAML is cached, but not shared between transliterators
+    metadata_yaml_str = yaml_str.replace("author: Author", "authors: [Author]")
+    gt = GraphTransliterator.from_yaml(metadata_yaml_str)
+    gt.metadata["authors"].append("Someone Else")
+    gt = GraphTransliterator.from_yaml(metadata_yaml_str)
+    assert gt.metadata["authors"] == ["Author"]
     assert GraphTransliterator.from_yaml_file(yaml_filename).transliterate("ab") == "A,B"
+    assert (
+        GraphTransliterator.from_yaml_file(
+            yaml_filename, charnames_escaped=False
+        ).transliterate("ab")
+        == "A,B"
+    )
+    assert (
+        GraphTransliterator.from_yaml_stream(io.StringIO(yaml_str)).transliterate("ab")
+        == "A,B"
+    )
+
+    # JSON cache of parsed YAML
+    cache_file = tmpdir.join("yaml_test.yaml.cache.json")
+    assert not cache_file.check()
+    gt = GraphTransliterator.from_yaml_file(yaml_filename, cache=True)
+    assert gt.transliterate("ab") == "A,B"
+    assert cache_file.check()
+    assert json.loads(cache_file.read())["settings"]["rules"]["a"] == "A"
+    # cache is used while YAML file is unchanged
+    cache_file.write(cache_file.read().replace('"A"', '"a"'))
+    gt = GraphTransliterator.from_yaml_file(yaml_filename, cache=True)
+    assert gt.transliterate("ab") == "a,B"
+    # but not with a different charnames_escaped
+    gt = GraphTransliterator.from_yaml_file(
+        yaml_filename, charnames_escaped=False, cache=True
+    )
+    assert gt.transliterate("ab") == "A,B"
     assert (
         GraphTransliterator.from_easyreading_dict(
             {
@@ -609,6 +686,31 @@ def test_GraphTransliterator_pruned_of():
     assert gt.pruned_of(["A", "B"])  # if no rules present will still work
 
 
+def test_GraphTransliterator_pruned_of_check_ambiguity():
+    gt = GraphTransliterator.from_yaml(
+        """
+            tokens:
+               a: [vowel]
+               ' ': [wb]
+            rules:
+               a: A
+               <vowel> a: X
+               a <vowel>: Y
+               <vowel> a <vowel>: Z
+            whitespace:
+               default: ' '
+               consolidate: true
+               token_class: wb
+        """
+    )
+    # Removing Z exposes the ambiguity of "<vowel> a" and "a <vowel>"
+    with pytest.raises(AmbiguousTransliterationRulesException):
+        gt.pruned_of(["Z"])
+    pruned = gt.pruned_of(["Z"], check_ambiguity=False)
+    assert pruned.transliterate("aaa") == "YXX"
+    assert pruned.tokenizer_pattern == gt.tokenizer_pattern
+
+
 def test_GraphTransliterator_graph():
     """Test graph."""
     tokens = {"ab": ["class_ab"], " ": ["wb"]}
@@ -619,3 +721,102 @@ def test_GraphTransliterator_graph():
     assert gt._graph
     assert gt._graph.node[0]["type"] == "Start"  # test for Start
     assert gt
+
+
+def test_GraphTransliterator_tokenize_longest_match():
+    """Test that tokenization matches the longest token at each position."""
+    gt = GraphTransliterator.from_yaml(
+        """
+            tokens:
+               a: [class1]
+               aa: [class1]
+               aab: [class1]
+               b: [class1]
+               ' ': [wb]
+            rules:
+               a: A
+               aa: <AA>
+               aab: <AAB>
+               b: B
+            whitespace:
+               default: ' '
+               consolidate: true
+               token_class: wb
+        """
+    )
+    assert gt.tokenize("aaa") == [" ", "aa", "a", " "]
+    assert gt.tokenize("aaab") == [" ", "aa", "a", "b", " "]
+    assert gt.tokenize("aab a") == [" ", "aab", " ", "a", " "]
+    assert gt.transliterate("aaba") == "<AAB>A"
+
+
+def test_GraphTransliterator_constraint_plans():
+    """Test that edge constraints are checked relative to the rule tokens."""
+    gt = GraphTransliterator.from_yaml(
+        """
+            tokens:
+               a: [vowel]
+               b: [consonant]
+               c: [consonant]
+               ' ': [wb]
+            rules:
+               a: A
+               b: B
+               c: C
+               ' ': ' '
+               (<consonant> b) a (b <consonant>): '!'
+            whitespace:
+               default: ' '
+               consolidate: true
+               token_class: wb
+        """
+    )
+    rule_key = [_.production for _ in gt.rules].index("!")
+    a_key = [_.production for _ in gt.rules].index("A")
+    assert gt.transliterate("bbabb") == "BB!BB"
+    assert gt.transliterate("cbabc") == "CB!BC"
+    assert gt.transliterate("babb") == "BABB"
+    assert gt.transliterate("bbab") == "BBAB"
+    assert gt.transliterate("bcabb") == "BCABB"
+    assert gt.transliterate("bbacb") == "BBACB"
+    assert gt.transliterate("bbabb babb bbabb") == "BB!BB BABB BB!BB"
+    tokens = gt.tokenize("cbabc")
+    assert gt.match_at(3, tokens) == rule_key
+    assert gt.match_at(3, tokens, match_all=True) == [rule_key, a_key]
+    assert gt.match_at(3, gt.tokenize("bcabb"), match_all=True) == [a_key]
+    assert gt.match_at(2, gt.tokenize("babb"), match_all=True) == [a_key]
+    # tokens need not be a list
+    assert gt.match_at(3, tuple(tokens), match_all=True) == [rule_key, a_key]
+
+
+def test_GraphTransliterator_cache_matches():
+    """Test that caching matches does not change transliteration."""
+    yaml_str = """
+        tokens:
+           a: [vowel]
+           b: [consonant]
+           ' ': [wb]
+        rules:
+           a: A
+           b: B
+           ' ': ' '
+           (<consonant> b) a (b <consonant>): '!'
+        whitespace:
+           default: ' '
+           consolidate: true
+           token_class: wb
+    """
+    gt = GraphTransliterator.from_yaml(yaml_str)
+    assert not gt.cache_matches
+    cached_gt = GraphTransliterator.from_yaml(yaml_str, cache_matches=True)
+    assert cached_gt.cache_matches
+    for input in ["bbabb babb bbabb", "babb bbabb babb", "bbab"]:
+        assert cached_gt.transliterate(input) == gt.transliterate(input)
+    cached_gt.cache_matches = False
+    assert not cached_gt.cache_matches
+    assert cached_gt.transliterate("bbabb babb") == "BB!BB BABB"
+    assert GraphTransliterator.load(gt.dump(), cache_matches=True).cache_matches
+    assert GraphTransliterator.loads_trusted(
+        gt.dumps(), cache_matches=True
+    ).cache_matches
+    assert "cache_matches" not in gt.dump()